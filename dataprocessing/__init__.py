@@ -7,6 +7,7 @@ from .exceptions import DataProcessingError, ColumnNotFoundError, FileReadError
 from .sql import SQLProcessor, sql_query, sql_execute, build_query
 from .live_data import LiveDataManager, DatabaseConnector, APIConnector, RealTimeDataStream
 from .simple_import import import_live, create_live_stream, EnhancedLiveData
+from .streaming import StreamingCSVData
 
 __version__ = "0.1.0"
 __author__ = "Your Name"
@@ -31,7 +32,8 @@ __all__ = [
     "APIConnector",
     "RealTimeDataStream",
     "import_live",
-    "EnhancedLiveData"
+    "EnhancedLiveData",
+    "StreamingCSVData"
 ]
 
 # Convenience function for quick loading
@@ -2,16 +2,29 @@
 Core CSVData class and main functions for DataProcessing package.
 """
 
+import os
+import json
+import weakref
 import pandas as pd
 import numpy as np
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Union, List, Dict, Any, Callable
-from .readers import read_csv_file, read_csv_with_info, preview_csv, get_csv_info
-from .writers import save_csv_file, save_csv_with_info, export_to_formats
+from typing import Optional, Union, List, Dict, Any, Callable, Sequence
+from .readers import read_csv_file, read_csv_with_info, preview_csv, get_csv_info, _nulls_to_nan
+from .writers import save_file, save_csv_with_info, export_to_formats
 from .exceptions import ColumnNotFoundError, ValidationError, DataTypeError
-from .utils import get_column_statistics, infer_data_types, sanitize_column_name
+from .utils import get_column_statistics, get_group_statistics, get_group_sums, infer_data_types, sanitize_column_name
 from .sql import SQLProcessor, sql_query, sql_execute
-from .live_data import LiveDataManager, connect_database, connect_api, create_stream, load_from_database, load_from_api
+from .sql_vectorized import build_lookup_index, plan_point_lookup, run_point_lookup
+from .live_data import LiveDataManager, connect_database, connect_api, create_stream, load_from_database
+from .live_data import load_from_api as _load_from_api, _split_database_uri
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 
 class CSVData:
@@ -19,6 +32,20 @@ class CSVData:
     A user-friendly wrapper around pandas DataFrame for CSV operations.
     """
     
+    # Rows and columns formatted by preview()
+    PREVIEW_ROWS = 10
+    PREVIEW_COLUMNS = 8
+    
+    # Bumped whenever the DataFrame is handed out (and may be edited in place)
+    _data_version = 0
+    
+    # (frame weakref, data state, engine, SQLProcessor) of the processor
+    # reused by sql() and sql_processor(); see _cached_processor
+    _sql_cache = None
+    
+    # (frame weakref, data state, {column: value index}) for point lookups
+    _index_cache = None
+    
     def __init__(self, data: Union[pd.DataFrame, str, Path], **kwargs):
         """
         Initialize CSVData with a DataFrame or file path.
@@ -34,9 +61,47 @@ class CSVData:
         else:
             raise ValueError("Data must be a DataFrame or file path")
     
+    @classmethod
+    def _wrap(cls, df: pd.DataFrame) -> 'CSVData':
+        """
+        Wrap a DataFrame that nothing else references, skipping the copy.
+        
+        Used for results the methods below build themselves (sorted, filtered,
+        query results, ...), which would otherwise be copied a second time.
+        """
+        data = cls.__new__(cls)
+        data._df = df
+        return data
+    
+    @classmethod
+    def from_sql(cls, uri: str, query: str, **kwargs) -> 'CSVData':
+        """
+        Load the result of a database query.
+        
+        SQLite and PostgreSQL results are transferred through ADBC drivers as
+        Arrow data when they are installed (see SQLiteConnector and
+        PostgreSQLConnector).
+        
+        Args:
+            uri: Database URI ('sqlite:///path/to.db', 'postgresql://...' or 'mysql://...')
+            query: SQL query to execute
+            **kwargs: Additional connection parameters
+            
+        Returns:
+            CSVData object with query results
+        """
+        db_type, connection_string = _split_database_uri(uri)
+        return cls._wrap(load_from_database(db_type, connection_string, query, **kwargs))
+    
     @property
     def df(self) -> pd.DataFrame:
-        """Get the underlying pandas DataFrame."""
+        """
+        Get the underlying pandas DataFrame.
+        
+        The frame can be edited in place through the returned reference, so
+        the cached SQL processor and lookup indexes are rebuilt on next use.
+        """
+        self._data_version += 1
         return self._df
     
     @property
@@ -63,6 +128,8 @@ class CSVData:
         if isinstance(key, str):
             if key not in self._df.columns:
                 raise ColumnNotFoundError(key, self._df.columns)
+            # The column may be edited in place, as with .df
+            self._data_version += 1
             return self._df[key]
         else:
             return CSVData(self._df[key])
@@ -71,6 +138,30 @@ class CSVData:
         """String representation of the CSVData object."""
         return f"CSVData(shape={self.shape}, columns={len(self.columns)})"
     
+    def preview(self) -> str:
+        """
+        Format the shape and first rows of the data as text.
+        
+        Only the first PREVIEW_ROWS rows and PREVIEW_COLUMNS columns are
+        formatted, so previewing a large result costs the same as previewing
+        a small one. Use data.df.to_string() to format every row.
+        
+        Returns:
+            The repr line followed by the formatted rows and "... N more"
+            lines for anything left out
+        """
+        header = repr(self)
+        rows, columns = self.shape
+        if rows == 0 or columns == 0:
+            return header
+        
+        lines = [header, self._df.iloc[:self.PREVIEW_ROWS, :self.PREVIEW_COLUMNS].to_string()]
+        if rows > self.PREVIEW_ROWS:
+            lines.append(f"... {rows - self.PREVIEW_ROWS} more rows")
+        if columns > self.PREVIEW_COLUMNS:
+            lines.append(f"... {columns - self.PREVIEW_COLUMNS} more columns")
+        return "\n".join(lines)
+    
     def head(self, n: int = 5) -> pd.DataFrame:
         """Get the first n rows."""
         return self._df.head(n)
@@ -124,8 +215,38 @@ class CSVData:
             raise ColumnNotFoundError(column, self._df.columns)
         
         sorted_df = self._df.sort_values(column, ascending=ascending)
-        return CSVData(sorted_df)
-    
+        return CSVData._wrap(sorted_df)
+
+    def filter_sort(self, condition, column: str, ascending: bool = True) -> 'CSVData':
+        """
+        Filter data and sort the surviving rows in a single pass.
+
+        Equivalent to ``data.where(condition).sort_by(column, ascending)``
+        but builds only one result instead of an intermediate copy per step.
+        Combine several conditions with ``&`` before calling.
+
+        Args:
+            condition: Boolean mask aligned with the rows (e.g., (age > 25) & (salary > 50000))
+            column: Column name to sort by
+            ascending: Sort order
+
+        Returns:
+            Filtered and sorted CSVData object
+        """
+        if column not in self._df.columns:
+            raise ColumnNotFoundError(column, self._df.columns)
+
+        positions = np.flatnonzero(np.asarray(condition, dtype=bool))
+        values = self._df[column].to_numpy()[positions]
+
+        order = np.argsort(values, kind='stable')
+        if not ascending:
+            # Keep missing values last, as sort_values does
+            missing = pd.isna(values[order])
+            order = np.concatenate([order[~missing][::-1], order[missing]])
+
+        return CSVData._wrap(self._df.iloc[positions[order]])
+
     def select_columns(self, columns: List[str]) -> 'CSVData':
         """
         Select specific columns.
@@ -158,7 +279,7 @@ class CSVData:
             raise ColumnNotFoundError(missing_columns[0], self._df.columns)
         
         dropped_df = self._df.drop(columns=columns)
-        return CSVData(dropped_df)
+        return CSVData._wrap(dropped_df)
     
     def rename_column(self, old_name: str, new_name: str) -> 'CSVData':
         """
@@ -190,7 +311,7 @@ class CSVData:
         """
         df_copy = self._df.copy()
         df_copy[name] = values
-        return CSVData(df_copy)
+        return CSVData._wrap(df_copy)
     
     def fill_missing(self, column: str, value) -> 'CSVData':
         """
@@ -207,8 +328,13 @@ class CSVData:
             raise ColumnNotFoundError(column, self._df.columns)
         
         df_copy = self._df.copy()
-        df_copy[column] = df_copy[column].fillna(value)
-        return CSVData(df_copy)
+        values = df_copy[column]
+        if isinstance(values.dtype, pd.CategoricalDtype) and pd.api.types.is_scalar(value) \
+                and value not in values.cat.categories:
+            # Dictionary-encoded columns only hold their own categories
+            values = values.cat.add_categories([value])
+        df_copy[column] = values.fillna(value)
+        return CSVData._wrap(df_copy)
     
     def drop_missing(self, columns: Optional[List[str]] = None) -> 'CSVData':
         """
@@ -228,7 +354,7 @@ class CSVData:
         else:
             dropped_df = self._df.dropna()
         
-        return CSVData(dropped_df)
+        return CSVData._wrap(dropped_df)
     
     def drop_duplicates(self, subset: Optional[List[str]] = None) -> 'CSVData':
         """
@@ -248,7 +374,7 @@ class CSVData:
         else:
             deduplicated_df = self._df.drop_duplicates()
         
-        return CSVData(deduplicated_df)
+        return CSVData._wrap(deduplicated_df)
     
     def summary(self) -> Dict[str, Any]:
         """
@@ -286,6 +412,43 @@ class CSVData:
             profiles[column] = get_column_statistics(self._df, column)
         return profiles
     
+    def group_stats(self, by: str, columns: List[str]) -> pd.DataFrame:
+        """
+        Get mean, min, max and count of numeric columns per group.
+        
+        Args:
+            by: Column to group by
+            columns: Numeric columns to summarize
+            
+        Returns:
+            DataFrame indexed by group with (column, statistic) columns
+        """
+        missing_columns = [col for col in [by] + list(columns) if col not in self._df.columns]
+        if missing_columns:
+            raise ColumnNotFoundError(missing_columns[0], self._df.columns)
+        
+        return get_group_statistics(self._df, by, columns)
+    
+    def group_sum(self, by: str, column: str) -> Dict[Any, Any]:
+        """
+        Get the sum of a column per group.
+        
+        Data already sorted by the group column (e.g. after sort_by) is
+        summed in a single linear pass.
+        
+        Args:
+            by: Column to group by
+            column: Column to sum
+            
+        Returns:
+            Dictionary mapping each group to its sum
+        """
+        missing_columns = [col for col in [by, column] if col not in self._df.columns]
+        if missing_columns:
+            raise ColumnNotFoundError(missing_columns[0], self._df.columns)
+        
+        return get_group_sums(self._df, by, column)
+    
     def check_missing(self) -> Dict[str, Any]:
         """
         Check for missing values in the data.
@@ -343,13 +506,13 @@ class CSVData:
     
     def save(self, file_path: Union[str, Path], **kwargs) -> None:
         """
-        Save the data to a CSV file.
+        Save the data to a CSV, Parquet (.parquet) or Excel (.xlsx) file.
         
         Args:
             file_path: Path where to save the file
-            **kwargs: Additional parameters for saving
+            **kwargs: Additional parameters for saving CSV files
         """
-        save_csv_file(self._df, file_path, **kwargs)
+        save_file(self._df, file_path, **kwargs)
     
     def save_with_info(self, file_path: Union[str, Path], **kwargs) -> Dict[str, Any]:
         """
@@ -390,27 +553,117 @@ class CSVData:
         """Convert to list of lists format."""
         return self._df.values.tolist()
     
-    def sql(self, query: str) -> 'CSVData':
+    def sql(
+        self,
+        query: str,
+        params: Optional[Union[Sequence, Dict[str, Any]]] = None,
+        engine: Optional[str] = None
+    ) -> 'CSVData':
         """
         Execute SQL query on the data.
         
         Args:
-            query: SQL query string
+            query: SQL query string, optionally with placeholders
+            params: Values bound to the placeholders
+            engine: 'sqlite', 'duckdb', 'polars' or 'numba' (see SQLProcessor);
+                None runs on SQLite
             
         Returns:
             CSVData object with query results
         """
-        result_df = sql_query(self, query)
-        return CSVData(result_df)
+        # SELECT ... FROM data WHERE col = value is answered from a value index,
+        # unless the caller asked for a specific engine
+        plan = plan_point_lookup(query) if engine is None else None
+        if plan is not None:
+            result_df = run_point_lookup(self._df, plan, params, self._lookup_index)
+            if result_df is not None:
+                return CSVData._wrap(result_df)
+        
+        if engine in ('polars', 'numba'):
+            result_df = self._cached_processor('sqlite').query(query, params, engine=engine)
+        else:
+            result_df = self._cached_processor(engine or 'sqlite').query(query, params)
+        return CSVData._wrap(result_df)
     
-    def sql_processor(self) -> SQLProcessor:
+    def sql_processor(self, engine: str = 'sqlite') -> SQLProcessor:
         """
         Get SQL processor for advanced SQL operations.
         
+        The processor (and the database table it loaded) is kept and handed
+        out again until the data changes, including values edited in place,
+        so repeated calls and sql() queries don't reload the data. Leaving a
+        with block keeps it open for the next call. After execute() or
+        register() the next call closes it and builds a fresh processor.
+        
+        Args:
+            engine: 'sqlite' or 'duckdb' (see SQLProcessor)
+        
         Returns:
             SQLProcessor object
         """
-        return SQLProcessor(self)
+        return self._cached_processor(engine)
+    
+    def _frame_layout(self) -> tuple:
+        """Columns, shape and dtypes of the data, to notice changes made through .df."""
+        return tuple(self._df.columns), self._df.shape, tuple(self._df.dtypes)
+    
+    def _frame_state(self) -> tuple:
+        """Data version plus layout, to notice changes made through .df."""
+        return self._data_version, self._frame_layout()
+    
+    def _lookup_index(self, column: str) -> Optional[Dict[Any, np.ndarray]]:
+        """
+        Value -> row positions index for a column, built on first use.
+        
+        Indexes are rebuilt when the wrapped DataFrame is replaced, its layout
+        changes or it was handed out through .df (see _cached_processor).
+        """
+        state = self._frame_state()
+        if self._index_cache is None or self._index_cache[0]() is not self._df or self._index_cache[1] != state:
+            self._index_cache = (weakref.ref(self._df), state, {})
+        indexes = self._index_cache[2]
+        if column not in indexes:
+            indexes[column] = build_lookup_index(self._df[column])
+        return indexes[column]
+    
+    def _cached_processor(self, engine: str) -> SQLProcessor:
+        """
+        Return the cached SQLProcessor for an engine, rebuilding it when needed.
+        
+        The processor is reused while the same DataFrame object is wrapped with
+        the same columns, dtypes and shape, nothing was executed on or
+        registered with it, and the frame wasn't handed out through .df or a
+        column since (either may be edited in place). Edits made through a
+        reference taken earlier aren't noticed; call clear_sql_cache() after
+        those.
+        """
+        state = self._frame_state()
+        if self._sql_cache is not None:
+            frame_ref, cached_state, cached_engine, processor = self._sql_cache
+            if frame_ref() is self._df and cached_state == state \
+                    and cached_engine == engine and processor.reusable:
+                return processor
+            self.clear_sql_cache()
+        
+        processor = SQLProcessor(self._df, engine)
+        processor._shared = True
+        self._sql_cache = (weakref.ref(self._df), state, engine, processor)
+        return processor
+    
+    def clear_sql_cache(self) -> None:
+        """
+        Stop reusing the cached SQL processor, so the next query reloads the data.
+        
+        The processor is closed, or at the end of its with block if one is
+        still using it. Point lookup indexes are dropped as well.
+        """
+        self._index_cache = None
+        if self._sql_cache is not None:
+            processor = self._sql_cache[3]
+            self._sql_cache = None
+            processor._shared = False
+            if not processor._entered:
+                processor.close()
     
     def live_data_manager(self) -> LiveDataManager:
         """
@@ -422,30 +675,169 @@ class CSVData:
         return LiveDataManager()
 
 
-def load(file_path: Union[str, Path], **kwargs) -> CSVData:
+# Parsed files kept by load(), most recently used last. Set the environment
+# variable DATAPROCESSING_LOAD_CACHE=0 to disable this and the Parquet cache.
+LOAD_CACHE_SIZE = 8
+_LOAD_CACHE: 'OrderedDict[tuple, pd.DataFrame]' = OrderedDict()
+
+
+def _load_cache_key(file_path: Union[str, Path], kwargs: Dict[str, Any]) -> Optional[tuple]:
+    """Cache key identifying a file's current contents and read options."""
+    if os.environ.get('DATAPROCESSING_LOAD_CACHE', '1') == '0':
+        return None
+    try:
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, tuple(sorted(kwargs.items())))
+        hash(key)
+    except (OSError, TypeError):
+        # Missing file (reported by the reader) or unhashable read options
+        return None
+    return key
+
+
+# Files at least this large get a Parquet copy next to them ('<file>.cache.parquet')
+# that later loads read instead of parsing the CSV again. Set the environment
+# variable DATAPROCESSING_PARQUET_CACHE=0 to neither read nor write these copies.
+PARQUET_CACHE_MIN_BYTES = 1 << 20
+PARQUET_CACHE_SUFFIX = '.cache.parquet'
+_PARQUET_CACHE_KEY = b'dataprocessing.source'
+
+
+def _parquet_cache_tag(key: tuple) -> bytes:
+    """Parquet metadata value identifying the CSV contents and read options a copy was made from."""
+    _, mtime_ns, size, options = key
+    return json.dumps({'mtime_ns': mtime_ns, 'size': size, 'options': repr(options)}).encode()
+
+
+def _parquet_cache_path(file_path: Union[str, Path], key: tuple) -> Optional[str]:
+    """Path of the Parquet copy of a file, or None if it shouldn't have one."""
+    if not PYARROW_AVAILABLE or os.environ.get('DATAPROCESSING_PARQUET_CACHE', '1') == '0':
+        return None
+    if key[2] < PARQUET_CACHE_MIN_BYTES:
+        # Parsing small files is cheaper than writing and reading the copy
+        return None
+    return str(file_path) + PARQUET_CACHE_SUFFIX
+
+
+def _read_parquet_cache(path: str, key: tuple, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """Read a Parquet copy if it was made from the current file with the same options."""
+    try:
+        schema = pq.read_schema(path)
+        if (schema.metadata or {}).get(_PARQUET_CACHE_KEY) != _parquet_cache_tag(key):
+            return None
+        if columns is not None and any(col not in schema.names for col in columns):
+            # Let the full load report the missing column
+            return None
+        # Only the requested columns' pages are read. Parquet stores missing
+        # text as null, which comes back as None instead of the parser's NaN.
+        return _nulls_to_nan(pq.read_table(path, columns=columns, use_pandas_metadata=True).to_pandas())
+    except (OSError, pa.ArrowException, ValueError):
+        # Missing or unreadable copy
+        return None
+
+
+def _write_parquet_cache(df: pd.DataFrame, path: str, key: tuple) -> None:
+    """Write a Parquet copy of a parsed file, skipping frames Parquet can't store."""
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        table = pa.Table.from_pandas(df)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_PARQUET_CACHE_KEY] = _parquet_cache_tag(key)
+        table = table.replace_schema_metadata(metadata)
+        pq.write_table(table, temp_path, compression='zstd', use_dictionary=True, data_page_size=1 << 20)
+        # Readers see either the old copy or the complete new one
+        os.replace(temp_path, path)
+    except (OSError, pa.ArrowException, TypeError, ValueError):
+        # Read-only directory, or columns with mixed types
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def load(
+    file_path: Union[str, Path],
+    streaming: bool = False,
+    columns: Optional[List[str]] = None,
+    cache: bool = True,
+    **kwargs
+) -> Union[CSVData, 'StreamingCSVData']:
     """
     Load a CSV file into a CSVData object.
     
+    Parsed files are cached by path, modification time, size and read
+    options, so loading an unchanged file again only copies the cached data.
+    Each call returns its own copy, so changes to one result don't show up
+    in later loads. Files of PARQUET_CACHE_MIN_BYTES or more are also saved
+    as a Parquet copy next to the CSV, which later loads (including ones in
+    new processes) read instead of parsing the CSV; with columns, only those
+    columns are read from it.
+    
     Args:
         file_path: Path to the CSV file
-        **kwargs: Additional parameters for reading
+        streaming: Return a StreamingCSVData that reads the file in batches
+            on demand instead of loading it (for files larger than memory)
+        columns: Load only these columns
+        cache: Use and update the in-memory and Parquet caches
+        **kwargs: Additional parameters for reading (encoding, delimiter and
+            block_size when streaming)
         
     Returns:
-        CSVData object
+        CSVData object, or StreamingCSVData object when streaming
     """
-    return CSVData(file_path, **kwargs)
+    if streaming:
+        from .streaming import StreamingCSVData
+        return StreamingCSVData(file_path, **kwargs)
+    
+    key = _load_cache_key(file_path, kwargs) if cache else None
+    if key is None:
+        data = CSVData(file_path, **kwargs)
+        return data if columns is None else CSVData._wrap(data.df).select_columns(columns)
+    
+    df = _LOAD_CACHE.get(key)
+    if df is None:
+        parquet_path = _parquet_cache_path(file_path, key)
+        if parquet_path is not None and columns is not None:
+            subset = _read_parquet_cache(parquet_path, key, columns)
+            if subset is not None:
+                return CSVData._wrap(subset)
+        
+        df = None if parquet_path is None else _read_parquet_cache(parquet_path, key)
+        if df is None:
+            df = read_csv_file(file_path, **kwargs)
+            if parquet_path is not None:
+                _write_parquet_cache(df, parquet_path, key)
+        # Older versions of the file can't be returned again
+        for stale in [cached for cached in _LOAD_CACHE if cached[0] == key[0] and cached[1:3] != key[1:3]]:
+            del _LOAD_CACHE[stale]
+        _LOAD_CACHE[key] = df
+        if len(_LOAD_CACHE) > LOAD_CACHE_SIZE:
+            _LOAD_CACHE.popitem(last=False)
+    else:
+        _LOAD_CACHE.move_to_end(key)
+    if columns is not None:
+        return CSVData._wrap(df).select_columns(columns)
+    return CSVData(df)
+
+
+def _clear_load_cache() -> None:
+    """Drop every file cached by load()."""
+    _LOAD_CACHE.clear()
+
+
+load.clear_cache = _clear_load_cache
 
 
-def save(data: CSVData, file_path: Union[str, Path], **kwargs) -> None:
+def save(data: Union[CSVData, pd.DataFrame], file_path: Union[str, Path], **kwargs) -> None:
     """
-    Save a CSVData object to a file.
+    Save data to a file, choosing the format from the extension.
     
     Args:
-        data: CSVData object to save
-        file_path: Path where to save the file
-        **kwargs: Additional parameters for saving
+        data: CSVData object or DataFrame to save
+        file_path: Path where to save the file (.csv, .csv.gz, .parquet or .xlsx)
+        **kwargs: Additional parameters for saving CSV files
     """
-    data.save(file_path, **kwargs)
+    if isinstance(data, CSVData):
+        data = data.df
+    save_file(data, file_path, **kwargs)
 
 
 def load_from_db(db_type: str, connection_string: str, query: str, **kwargs) -> CSVData:
@@ -477,7 +869,7 @@ def load_from_api(base_url: str, endpoint: str, **kwargs) -> CSVData:
     Returns:
         CSVData object with API response
     """
-    df = load_from_api(base_url, endpoint, **kwargs)
+    df = _load_from_api(base_url, endpoint, **kwargs)
     return CSVData(df)
 
 
@@ -4,18 +4,122 @@ Supports databases, APIs, and real-time data sources.
 """
 
 import pandas as pd
+import numpy as np
 import requests
 import json
 import sqlite3
-import psycopg2
-import mysql.connector
-from typing import Union, Dict, List, Any, Optional, Callable
+from typing import Union, Dict, List, Any, Optional, Callable, Tuple
 from pathlib import Path
 import time
 import threading
 from datetime import datetime, timedelta
 from .exceptions import DataProcessingError
 
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def records_to_dataframe(records: List[Any]) -> pd.DataFrame:
+    """
+    Convert a list of records (e.g. JSON objects) to a DataFrame.
+    
+    Lists of flat dicts are built with pyarrow, which infers column types and
+    fills the columns in native code rather than per value in Python.
+    Records with nested (list or object) fields, or values pyarrow can't
+    type, are built by pandas, which keeps such values as Python objects.
+    
+    Args:
+        records: List of records
+        
+    Returns:
+        DataFrame with one row per record
+    """
+    if PYARROW_AVAILABLE and records:
+        try:
+            array = pa.array(records)
+        except (pa.ArrowException, TypeError, ValueError, OverflowError):
+            # Mixed value types within a field, integers beyond int64, or
+            # nested data pyarrow can't infer
+            array = None
+        
+        if array is not None and pa.types.is_struct(array.type) and array.type.num_fields > 0 \
+                and not any(pa.types.is_nested(field.type) for field in array.type):
+            return pa.Table.from_struct_array(array).to_pandas()
+    
+    return pd.DataFrame(records)
+
+
+def json_to_dataframe(data: Any) -> pd.DataFrame:
+    """
+    Convert a JSON response to a DataFrame.
+    
+    Args:
+        data: Parsed JSON (a list of records, or an object with a 'data' or 'results' list)
+        
+    Returns:
+        DataFrame with response data
+    """
+    if isinstance(data, list):
+        return records_to_dataframe(data)
+    elif isinstance(data, dict):
+        if 'data' in data:
+            return records_to_dataframe(data['data'])
+        elif 'results' in data:
+            return records_to_dataframe(data['results'])
+        else:
+            return pd.DataFrame([data])
+    else:
+        return pd.DataFrame(data)
+
+
+def _fetch_arrow_dataframe(connection, sql: str) -> pd.DataFrame:
+    """
+    Run a query on an ADBC connection and convert the result once.
+    
+    ADBC drivers return result sets as Arrow record batches, so columns are
+    transferred and typed natively instead of one Python object per cell.
+    
+    Args:
+        connection: ADBC DB-API connection
+        sql: SQL query string
+        
+    Returns:
+        DataFrame with query results
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(sql)
+        return cursor.fetch_arrow_table().to_pandas()
+    finally:
+        cursor.close()
+
+
+def _split_database_uri(uri: str) -> Tuple[str, str]:
+    """
+    Split a database URI into a database type and connection string.
+    
+    Args:
+        uri: 'sqlite:///path/to.db', 'postgresql://...' or 'mysql://...'
+        
+    Returns:
+        (db_type, connection_string) as accepted by connect_database()
+    """
+    scheme, separator, rest = uri.partition('://')
+    scheme = scheme.lower()
+    if not separator:
+        raise DataProcessingError(f"Not a database URI: {uri}")
+    if scheme == 'sqlite':
+        # sqlite:///relative.db, sqlite:////absolute.db, sqlite:///:memory:
+        return 'sqlite', rest[1:] if rest.startswith('/') else rest
+    if scheme in ('postgresql', 'postgres'):
+        return 'postgresql', 'postgresql://' + rest
+    if scheme == 'mysql':
+        return 'mysql', uri
+    raise DataProcessingError(f"Unsupported database type: {scheme}")
+
 
 class DatabaseConnector:
     """Base class for database connections."""
@@ -31,6 +135,8 @@ class DatabaseConnector:
         self.connection_string = connection_string
         self.connection = None
         self.kwargs = kwargs
+        # True when the connection is an ADBC (Arrow) connection
+        self.adbc = False
     
     def connect(self):
         """Establish database connection."""
@@ -59,16 +165,59 @@ class DatabaseConnector:
 
 
 class SQLiteConnector(DatabaseConnector):
-    """SQLite database connector."""
+    """
+    SQLite database connector.
+    
+    Uses the ADBC SQLite driver (installed with the "fast" extra) for
+    database files when it is available, and sqlite3 otherwise. The ADBC
+    driver types each result column from its first rows, so queries it
+    can't type (a column holding integers and then text, as SQLite allows)
+    are run again through sqlite3.
+    """
+    
+    # sqlite3 connection for queries the ADBC driver can't type, opened on first use
+    _sqlite3_connection = None
     
     def connect(self):
         """Connect to SQLite database."""
+        # A fallback connection to an in-memory database would see an empty one
+        in_memory = self.connection_string in ('', ':memory:') or 'mode=memory' in self.connection_string
+        if not in_memory:
+            try:
+                import adbc_driver_sqlite.dbapi
+            except ImportError:
+                pass
+            else:
+                # Without autocommit the first SELECT leaves a read transaction
+                # open, and later queries wouldn't see other connections' writes
+                self.connection = adbc_driver_sqlite.dbapi.connect(self.connection_string, autocommit=True)
+                self.adbc = True
+                return
+        
         self.connection = sqlite3.connect(self.connection_string)
+        self.adbc = False
     
     def query(self, sql: str) -> pd.DataFrame:
         """Execute SQL query and return DataFrame."""
+        if self.adbc:
+            try:
+                return _fetch_arrow_dataframe(self.connection, sql)
+            except OSError as e:
+                # The driver's Arrow stream reports a mixed-type column as an I/O error
+                if 'Type mismatch' not in str(e):
+                    raise
+                if self._sqlite3_connection is None:
+                    self._sqlite3_connection = sqlite3.connect(self.connection_string)
+                return pd.read_sql_query(sql, self._sqlite3_connection)
         return pd.read_sql_query(sql, self.connection)
     
+    def disconnect(self):
+        """Close the connection and the sqlite3 connection used for fallbacks."""
+        if self._sqlite3_connection is not None:
+            self._sqlite3_connection.close()
+            self._sqlite3_connection = None
+        super().disconnect()
+    
     def execute(self, sql: str) -> None:
         """Execute SQL statement."""
         cursor = self.connection.cursor()
@@ -77,10 +226,39 @@ class SQLiteConnector(DatabaseConnector):
 
 
 class PostgreSQLConnector(DatabaseConnector):
-    """PostgreSQL database connector."""
+    """
+    PostgreSQL database connector.
+    
+    Connects through the ADBC PostgreSQL driver, which streams results as
+    Arrow. psycopg2 is used instead when connection keyword arguments are
+    given or the ADBC driver is not installed.
+    """
     
     def connect(self):
         """Connect to PostgreSQL database."""
+        if not self.kwargs:
+            try:
+                import adbc_driver_postgresql.dbapi
+            except ImportError:
+                pass
+            else:
+                # libpq accepts both postgresql:// URIs and key=value strings
+                # Autocommit, so that queries don't leave the session idle in a transaction
+                self.connection = adbc_driver_postgresql.dbapi.connect(self.connection_string, autocommit=True)
+                self.adbc = True
+                return
+        
+        try:
+            import psycopg2
+        except ImportError:
+            if self.kwargs:
+                raise ImportError("PostgreSQL connection keyword arguments require psycopg2: "
+                                  "pip install psycopg2-binary")
+            raise ImportError(
+                "PostgreSQL support requires adbc-driver-postgresql: pip install dataprocessing[postgres]"
+            )
+        self.adbc = False
+        
         # Parse connection string or use kwargs
         if self.connection_string.startswith('postgresql://'):
             # Parse URL-style connection string
@@ -100,6 +278,8 @@ class PostgreSQLConnector(DatabaseConnector):
     
     def query(self, sql: str) -> pd.DataFrame:
         """Execute SQL query and return DataFrame."""
+        if self.adbc:
+            return _fetch_arrow_dataframe(self.connection, sql)
         return pd.read_sql_query(sql, self.connection)
     
     def execute(self, sql: str) -> None:
@@ -114,6 +294,13 @@ class MySQLConnector(DatabaseConnector):
     
     def connect(self):
         """Connect to MySQL database."""
+        try:
+            import mysql.connector
+        except ImportError:
+            raise ImportError(
+                "MySQL support requires mysql-connector-python: pip install dataprocessing[mysql]"
+            )
+        
         # Parse connection string or use kwargs
         if self.connection_string.startswith('mysql://'):
             import urllib.parse
@@ -209,17 +396,20 @@ class APIConnector:
     
     def _json_to_dataframe(self, data: Any) -> pd.DataFrame:
         """Convert JSON response to DataFrame."""
-        if isinstance(data, list):
-            return pd.DataFrame(data)
-        elif isinstance(data, dict):
-            if 'data' in data:
-                return pd.DataFrame(data['data'])
-            elif 'results' in data:
-                return pd.DataFrame(data['results'])
-            else:
-                return pd.DataFrame([data])
-        else:
-            return pd.DataFrame(data)
+        return json_to_dataframe(data)
+
+
+def _column_dtype(value: Any) -> np.dtype:
+    """Get the NumPy dtype used to buffer a record value."""
+    if isinstance(value, (bool, np.bool_)):
+        return np.dtype(bool)
+    if isinstance(value, (int, np.integer)):
+        return np.dtype(np.int64)
+    if isinstance(value, (float, np.floating)):
+        return np.dtype(np.float64)
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return np.dtype('datetime64[ns]')
+    return np.dtype(object)
 
 
 class RealTimeDataStream:
@@ -230,6 +420,10 @@ class RealTimeDataStream:
         """
         Initialize real-time data stream.
         
+        When max_records is set and the source returns dicts with the same
+        keys and value types, records are written into a preallocated
+        structured array used as a ring buffer. Other data is kept in a list.
+        
         Args:
             data_source: Function that returns data
             interval: Time interval between data collection (seconds)
@@ -242,6 +436,11 @@ class RealTimeDataStream:
         self.is_running = False
         self.thread = None
         self.lock = threading.Lock()
+        
+        # Ring buffer state
+        self._records = None
+        self._record_count = 0
+        self._write_position = 0
     
     def start(self):
         """Start data collection."""
@@ -266,23 +465,103 @@ class RealTimeDataStream:
                 data = self.data_source()
                 if data is not None:
                     with self.lock:
-                        self.data_buffer.append({
-                            'timestamp': datetime.now(),
-                            'data': data
-                        })
-                        
-                        # Limit buffer size
-                        if self.max_records and len(self.data_buffer) > self.max_records:
-                            self.data_buffer = self.data_buffer[-self.max_records:]
+                        self._add_record(data, datetime.now())
                 
                 time.sleep(self.interval)
             except Exception as e:
                 print(f"Error collecting data: {e}")
                 time.sleep(self.interval)
     
+    def _add_record(self, data: Any, timestamp: datetime):
+        """Add a record to the buffer. Must be called with the lock held."""
+        if self._records is None and not self.data_buffer and self.max_records and isinstance(data, dict):
+            self._allocate_records(data)
+        
+        if self._records is not None:
+            if self._write_ring_buffer(data, timestamp):
+                return
+            # Record doesn't fit the buffered layout; switch to the list buffer
+            self.data_buffer = self._buffered_items()
+            self._records = None
+        
+        self.data_buffer.append({
+            'timestamp': timestamp,
+            'data': data
+        })
+        
+        # Limit buffer size
+        if self.max_records and len(self.data_buffer) > self.max_records:
+            self.data_buffer = self.data_buffer[-self.max_records:]
+    
+    def _allocate_records(self, sample: Dict[str, Any]):
+        """Allocate the ring buffer with a layout inferred from a sample record."""
+        if 'timestamp' in sample or not all(isinstance(key, str) for key in sample):
+            return
+        
+        fields = [(key, _column_dtype(value)) for key, value in sample.items()]
+        fields.append(('timestamp', np.dtype('datetime64[ns]')))
+        self._records = np.empty(self.max_records, dtype=fields)
+        self._record_count = 0
+        self._write_position = 0
+    
+    def _write_ring_buffer(self, data: Any, timestamp: datetime) -> bool:
+        """Write a record into the ring buffer, returning False if it doesn't fit."""
+        names = self._records.dtype.names
+        
+        if not isinstance(data, dict) or len(data) != len(names) - 1:
+            return False
+        
+        values = []
+        for name in names[:-1]:
+            if name not in data:
+                return False
+            
+            value = data[name]
+            field_dtype = self._records.dtype.fields[name][0]
+            if field_dtype != object and _column_dtype(value) != field_dtype:
+                return False
+            values.append(value)
+        
+        try:
+            self._records[self._write_position] = tuple(values) + (np.datetime64(timestamp, 'ns'),)
+        except (OverflowError, ValueError, TypeError):
+            return False
+        
+        self._write_position = (self._write_position + 1) % self.max_records
+        self._record_count = min(self._record_count + 1, self.max_records)
+        return True
+    
+    def _ordered_records(self) -> np.ndarray:
+        """Get ring buffer records in collection order."""
+        if self._record_count < self.max_records:
+            return self._records[:self._record_count]
+        return np.concatenate([self._records[self._write_position:], self._records[:self._write_position]])
+    
+    def _buffered_items(self) -> List[Dict[str, Any]]:
+        """Convert ring buffer records to list buffer items."""
+        items = []
+        for row in self._ordered_records():
+            record = {}
+            for name in row.dtype.names:
+                value = row[name]
+                if isinstance(value, np.datetime64):
+                    value = pd.Timestamp(value).to_pydatetime()
+                elif isinstance(value, np.generic):
+                    value = value.item()
+                record[name] = value
+            
+            timestamp = record.pop('timestamp')
+            items.append({'timestamp': timestamp, 'data': record})
+        return items
+    
     def get_latest_data(self) -> pd.DataFrame:
         """Get latest collected data as DataFrame."""
         with self.lock:
+            if self._records is not None:
+                if self._record_count == 0:
+                    return pd.DataFrame()
+                return pd.DataFrame(self._ordered_records())
+            
             if not self.data_buffer:
                 return pd.DataFrame()
             
@@ -305,6 +584,9 @@ class RealTimeDataStream:
         """Clear data buffer."""
         with self.lock:
             self.data_buffer.clear()
+            self._records = None
+            self._record_count = 0
+            self._write_position = 0
 
 
 class LiveDataManager:
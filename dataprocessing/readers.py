@@ -2,7 +2,10 @@
 CSV file reading functionality for DataProcessing package.
 """
 
+import datetime
+import re
 import pandas as pd
+import numpy as np
 import gzip
 import zipfile
 from pathlib import Path
@@ -16,12 +19,151 @@ from .utils import (
     format_file_size
 )
 
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Text columns with at most this fraction of distinct values are stored as
+# categoricals: one small integer code per row plus a table of the values
+DICTIONARY_ENCODE_RATIO = 0.1
+
+# Rows checked before factorizing a whole column
+_DICTIONARY_SAMPLE_ROWS = 10_000
+
+# Rows read with the C parser to choose between the parsers, and text that
+# the pyarrow parser may infer as a date, time or timestamp
+_SNIFF_ROWS = 1_000
+_TEMPORAL_TEXT = re.compile(r'\s*(\d{4}-\d{1,2}-\d{1,2}|\d{1,2}:\d{2})')
+
+
+def _temporal_columns(df: pd.DataFrame) -> list:
+    """Columns the pyarrow parser converted to dates, times or timestamps."""
+    columns = []
+    for position, column in enumerate(df.columns):
+        series = df.iloc[:, position]
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            columns.append(column)
+        elif series.dtype == object:
+            # Arrow columns hold one type, so the first value tells
+            valid = series.notna().to_numpy()
+            if not valid.any():
+                continue
+            if isinstance(series.iloc[valid.argmax()], (datetime.date, datetime.time)):
+                columns.append(column)
+    return columns
+
+
+def _may_hold_temporal(source, kwargs: Dict[str, Any]) -> bool:
+    """Whether the first rows have text the pyarrow parser could read as dates, times or timestamps."""
+    try:
+        sample = pd.read_csv(source, **{**kwargs, 'nrows': _SNIFF_ROWS})
+    except Exception:
+        # Reported by the full read
+        return True
+    finally:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+    for position in range(sample.shape[1]):
+        series = sample.iloc[:, position]
+        if series.dtype == object and series.dropna().astype(str).str.match(_TEMPORAL_TEXT).any():
+            return True
+    return False
+
+
+def _nulls_to_nan(df: pd.DataFrame) -> pd.DataFrame:
+    """Replace the None the pyarrow parser leaves in text columns with NaN, as the C parser does."""
+    for position in range(df.shape[1]):
+        series = df.iloc[:, position]
+        if series.dtype != object:
+            continue
+        missing = series.isna().to_numpy()
+        if missing.any():
+            values = series.to_numpy(copy=True)
+            values[missing] = np.nan
+            df.isetitem(position, values)
+    return df
+
+
+def _read_csv(source, **kwargs) -> pd.DataFrame:
+    """
+    Read CSV data, using the multithreaded pyarrow parser when possible.
+    
+    The result has the same column types as with the pandas C parser, with
+    missing text values as NaN. The pyarrow parser reads text that looks like
+    dates, times or timestamps as those types, so files with such columns are
+    read with the C parser: the first rows are checked up front, and a full
+    pyarrow read that still finds one is discarded. The C parser is also used
+    when pyarrow is not installed, an engine, parse_dates or nrows was given,
+    or the pyarrow engine rejects an option or the file contents.
+    
+    Args:
+        source: File path or buffer
+        **kwargs: pandas read_csv parameters
+        
+    Returns:
+        Pandas DataFrame
+    """
+    if PYARROW_AVAILABLE and not {'engine', 'parse_dates', 'nrows'} & kwargs.keys() \
+            and not _may_hold_temporal(source, kwargs):
+        try:
+            df = pd.read_csv(source, engine='pyarrow', **kwargs)
+            # Dates further down the file than the checked rows
+            if not _temporal_columns(df):
+                return _nulls_to_nan(df)
+        except ValueError:
+            # Unsupported option or input the pyarrow parser rejects
+            pass
+        if hasattr(source, 'seek'):
+            source.seek(0)
+    
+    return pd.read_csv(source, **kwargs)
+
+
+def dictionary_encode(df: pd.DataFrame, max_ratio: float = DICTIONARY_ENCODE_RATIO, skip=()) -> pd.DataFrame:
+    """
+    Convert low-cardinality text columns to categoricals in place.
+    
+    Grouping, comparisons and joins on these columns then work on integer
+    codes, and DuckDB/Polars receive them as dictionary-encoded columns.
+    Categories are sorted, so sorting by the column orders it as before.
+    
+    Args:
+        df: DataFrame to convert
+        max_ratio: Largest distinct-values-to-rows ratio that is converted
+        skip: Column names to leave unchanged
+        
+    Returns:
+        The same DataFrame
+    """
+    for position, column in enumerate(df.columns):
+        series = df.iloc[:, position]
+        max_unique = int(len(series) * max_ratio)
+        if column in skip or series.dtype != object or max_unique == 0:
+            continue
+        # Most high-cardinality columns are ruled out by their first rows
+        if series.iloc[:_DICTIONARY_SAMPLE_ROWS].nunique() > max_unique:
+            continue
+        
+        try:
+            codes, uniques = pd.factorize(series, sort=True)
+        except TypeError:
+            # Values of mixed types don't sort
+            continue
+        if len(uniques) > max_unique or not all(isinstance(value, str) for value in uniques):
+            continue
+        df.isetitem(position, pd.Categorical.from_codes(codes, categories=uniques))
+    
+    return df
+
 
 def read_csv_file(
     file_path: Union[str, Path],
     encoding: Optional[str] = None,
     delimiter: Optional[str] = None,
     header: Optional[int] = 0,
+    categorize: bool = False,
     **kwargs
 ) -> pd.DataFrame:
     """
@@ -32,6 +174,9 @@ def read_csv_file(
         encoding: File encoding (auto-detected if None)
         delimiter: CSV delimiter (auto-detected if None)
         header: Row number to use as header (0 for first row, None for no header)
+        categorize: Store low-cardinality text columns as categoricals (see dictionary_encode).
+            Writing a value that isn't a category yet to such a column
+            (assignment, fill or replace rules) needs add_categories first.
         **kwargs: Additional pandas read_csv parameters
         
     Returns:
@@ -56,17 +201,22 @@ def read_csv_file(
         
         # Handle compressed files
         if is_compressed_file(file_path):
-            return _read_compressed_csv(file_path, encoding, delimiter, header, **kwargs)
-        
-        # Read the CSV file
-        df = pd.read_csv(
-            file_path,
-            encoding=encoding,
-            sep=delimiter,
-            header=header,
-            **kwargs
-        )
+            df = _read_compressed_csv(file_path, encoding, delimiter, header, **kwargs)
+        else:
+            # Read the CSV file
+            df = _read_csv(
+                file_path,
+                encoding=encoding,
+                sep=delimiter,
+                header=header,
+                **kwargs
+            )
         
+        if categorize:
+            # Columns given an explicit dtype keep it
+            dtype = kwargs.get('dtype')
+            if dtype is None or isinstance(dtype, dict):
+                dictionary_encode(df, skip=dtype or ())
         return df
         
     except Exception as e:
@@ -7,6 +7,7 @@ import pandas as pd
 from typing import Union, Optional
 from .core import CSVData
 from .simple_live import SimpleLiveData, LiveCSVData
+from .sql import SQLProcessor
 
 
 def import_data(url: str) -> SimpleLiveData:
@@ -134,6 +135,34 @@ class EnhancedLiveData(SimpleLiveData):
     def __init__(self, source: str, interval: int = 3600):
         super().__init__(source, interval)
         self._table_name = "data"  # Default table name for SQL queries
+        # One SQL connection is kept for the object's lifetime; the current
+        # DataFrame is (re-)registered only when the data is refreshed
+        self._sql_processor = None
+        self._registered_df = None
+    
+    def _query(self, query: str) -> pd.DataFrame:
+        """
+        Run a query against the current data on the persistent SQLProcessor.
+        
+        The DataFrame is reloaded into the processor's database only when
+        the data changes.
+        """
+        data = self.get_data()
+        df = data.df
+        
+        if self._sql_processor is None:
+            self._sql_processor = SQLProcessor(data)
+        elif self._registered_df is not df:
+            self._sql_processor.register(self._table_name, df)
+        self._registered_df = df
+        return self._sql_processor.query(query)
+    
+    def close_sql(self):
+        """Close the persistent SQL connection."""
+        if self._sql_processor is not None:
+            self._sql_processor.close()
+            self._sql_processor = None
+        self._registered_df = None
     
     def sql(self, query: str) -> CSVData:
         """
@@ -149,7 +178,7 @@ class EnhancedLiveData(SimpleLiveData):
         query = query.replace('teacher_data', 'data')
         query = query.replace('live_data', 'data')
         
-        return super().sql(query)
+        return CSVData(self._query(query))
     
     @property
     def columns(self):
@@ -3,76 +3,497 @@ SQL functionality for DataProcessing package.
 Allows users to write SQL queries on CSV data.
 """
 
+import re
+import numpy as np
 import pandas as pd
 import sqlite3
-import tempfile
-import os
-from typing import Union, List, Dict, Any, Optional
+from functools import lru_cache
+from typing import Union, List, Dict, Any, Optional, Sequence
 from pathlib import Path
 from .exceptions import DataProcessingError
+from .sql_vectorized import (
+    NUMBA_AVAILABLE, plan_case_group_query, plan_group_query, plan_projection_query,
+    run_case_group_query, run_group_query, run_projection_query
+)
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+    # Errors of queries Polars can't run and of tables it can't convert
+    # (pyarrow's conversion errors subclass the built-in ones); such queries
+    # fall back to the main engine
+    _POLARS_FALLBACK_ERRORS = (pl.exceptions.PolarsError, TypeError, ValueError, NotImplementedError)
+except ImportError:
+    POLARS_AVAILABLE = False
+
+SQL_ENGINES = ('sqlite', 'duckdb')
+
+
+# SQLite column type for each pandas.api.types.infer_dtype result, matching
+# the types DataFrame.to_sql uses for SQLite
+_SQLITE_TYPES = {
+    'integer': 'INTEGER',
+    'boolean': 'INTEGER',
+    'floating': 'REAL',
+    'mixed-integer-float': 'REAL',
+    'datetime64': 'TIMESTAMP',
+    'datetime': 'TIMESTAMP',
+    'date': 'DATE',
+    'string': 'TEXT',
+    'categorical': 'TEXT',
+    'empty': 'TEXT',
+}
+
+
+# Number of prepared statements each SQLProcessor connection keeps. sqlite3
+# caches statements by their exact SQL text, so repeated queries (ideally
+# with bind parameters rather than formatted values) skip parsing and planning.
+STATEMENT_CACHE_SIZE = 128
+
+# Quoted strings, quoted identifiers ("...", `...` and [...]) and block
+# comments, whose whitespace is kept as written
+_QUOTED_SQL = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`(?:[^`]|``)*`|\[[^\]]*\]|/\*.*?\*/)""", re.S)
+
+# Left outside the quoted parts only by line comments and unterminated quotes
+_UNMATCHED_SQL = re.compile(r"""--|/\*|['"`\[]""")
+
+
+@lru_cache(maxsize=256)
+def _normalize_sql(sql: str) -> str:
+    """
+    Collapse whitespace outside quoted strings, identifiers and comments.
+    
+    Queries that only differ in layout then share one cached statement.
+    SQL containing line comments or unterminated quotes is returned stripped
+    but otherwise unchanged.
+    """
+    parts = _QUOTED_SQL.split(sql)
+    if any(_UNMATCHED_SQL.search(part) for part in parts[::2]):
+        return sql.strip()
+    parts[::2] = [re.sub(r'\s+', ' ', part) for part in parts[::2]]
+    return ''.join(parts).strip()
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote a table or column name for SQLite."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _bulk_load(df: pd.DataFrame, connection: sqlite3.Connection, name: str) -> None:
+    """
+    Load a DataFrame into a SQLite table, replacing any existing table.
+    
+    Values are converted column by column and inserted with a single
+    executemany call. Column types the fast path doesn't handle fall back to
+    DataFrame.to_sql.
+    
+    Args:
+        df: DataFrame to load
+        connection: SQLite connection
+        name: Table name
+    """
+    column_types = []
+    columns = []
+    
+    for column in df.columns:
+        series = df[column]
+        inferred = pd.api.types.infer_dtype(series, skipna=True)
+        if inferred not in _SQLITE_TYPES or isinstance(series.dtype, pd.DatetimeTZDtype):
+            df.to_sql(name, connection, if_exists='replace', index=False)
+            return
+        
+        # Native Python values; dates are stored as text, as sqlite3 would
+        values = series.astype(object)
+        if inferred == 'date':
+            values = values.map(lambda value: value.isoformat(), na_action='ignore')
+        elif inferred in ('datetime64', 'datetime'):
+            values = values.map(lambda value: value.isoformat(' '), na_action='ignore')
+        
+        column_types.append(f"{_quote_identifier(column)} {_SQLITE_TYPES[inferred]}")
+        columns.append(values.where(series.notna(), None).tolist())
+    
+    table = _quote_identifier(name)
+    placeholders = ', '.join('?' * len(columns))
+    
+    connection.execute(f"DROP TABLE IF EXISTS {table}")
+    connection.execute(f"CREATE TABLE {table} ({', '.join(column_types)})")
+    if columns:
+        connection.executemany(f"INSERT INTO {table} VALUES ({placeholders})", zip(*columns))
+    connection.commit()
+
+
+# DuckDB sums integers into 128-bit HUGEINTs; SQLite returns 64-bit integers
+_DUCKDB_WIDE_INTEGERS = ('HUGEINT', 'UHUGEINT')
+
+# Largest integer magnitude a float64 holds exactly
+_MAX_EXACT_FLOAT_INTEGER = 2 ** 53
+
+
+def _fetch_duckdb(result, as_arrow: bool) -> Union[pd.DataFrame, 'pa.Table']:
+    """
+    Fetch a DuckDB result with the integer types SQLite would return.
+    
+    HUGEINT columns (e.g. SUM of an integer column) reach pandas as float64
+    and Arrow as decimal128; they are converted to int64 when every value fits.
+    """
+    wide = [i for i, column in enumerate(result.description) if str(column[1]) in _DUCKDB_WIDE_INTEGERS]
+    if as_arrow:
+        # to_arrow_table replaced fetch_arrow_table in newer DuckDB releases
+        to_arrow = getattr(result, 'to_arrow_table', None) or result.fetch_arrow_table
+        table = to_arrow()
+        for i in wide:
+            try:
+                table = table.set_column(i, table.field(i).name, table.column(i).cast(pa.int64()))
+            except pa.ArrowInvalid:
+                # Values beyond int64 stay decimal
+                pass
+        return table
+    
+    df = result.fetch_df()
+    for i in wide:
+        values = df.iloc[:, i]
+        # NULLs (as in SQLite's result) keep the column float
+        if values.notna().all() and (values.abs() <= _MAX_EXACT_FLOAT_INTEGER).all():
+            df.isetitem(i, values.astype(np.int64))
+    return df
+
+
+def _polars_frame(df: Union[pd.DataFrame, 'pa.Table']) -> 'pl.LazyFrame':
+    """Convert a DataFrame or pyarrow Table to a Polars LazyFrame."""
+    if PYARROW_AVAILABLE and isinstance(df, pa.Table):
+        return pl.from_arrow(df).lazy()
+    return pl.from_pandas(df).lazy()
+
+
+def _query_frame(
+    df: pd.DataFrame,
+    sql: str,
+    params: Optional[Union[Sequence, Dict[str, Any]]],
+    engine: str,
+    as_arrow: bool
+) -> Optional[Union[pd.DataFrame, 'pa.Table']]:
+    """
+    Run a query of a single 'data' table on the Polars or Numba engine.
+    
+    Args:
+        df: The data table
+        sql: SQL query string
+        params: Values bound to placeholders; neither engine supports them
+        engine: 'polars' or 'numba'
+        as_arrow: Return a pyarrow Table instead of a DataFrame
+        
+    Returns:
+        Query results, or None if the engine can't run the query
+    """
+    if engine == 'polars':
+        if not POLARS_AVAILABLE:
+            raise ImportError("The polars engine requires polars: pip install dataprocessing[fast]")
+        if params is None:
+            try:
+                result = pl.SQLContext(frames={'data': _polars_frame(df)}).execute(sql).collect()
+                return result.to_arrow() if as_arrow else result.to_pandas()
+            except _POLARS_FALLBACK_ERRORS:
+                pass
+        return None
+    
+    if not NUMBA_AVAILABLE:
+        raise ImportError("The numba engine requires numba: pip install dataprocessing[fast]")
+    if params is None and isinstance(df, pd.DataFrame):
+        plan = plan_projection_query(sql)
+        if plan is not None:
+            return run_projection_query(df, plan, as_arrow)
+    return None
 
 
 class SQLProcessor:
     """
-    SQL processor for CSV data using SQLite backend.
+    SQL processor for CSV data using a SQLite or DuckDB backend.
+    
+    SQLite (the default) copies the data into an in-memory database. DuckDB
+    (engine='duckdb', installed with the "fast" extra) queries the DataFrame's
+    columns in place with a vectorized engine, but follows its own SQL dialect:
+    integer division returns floats, LIKE is case-sensitive and bare columns
+    next to aggregates are rejected. Placeholders are ? for both, with named
+    parameters written as :name for SQLite and $name for DuckDB.
+    
+    Individual queries can also run on Polars (query(sql, engine='polars')),
+    which optimizes them as a LazyFrame plan, or on Numba
+    (query(sql, engine='numba')), which compiles column/arithmetic/CASE
+    projections of the data table into parallel kernels. Queries these
+    engines can't run fall back to the processor's own engine.
+    
+    On SQLite, CASE bucketing queries (see plan_case_group_query) and simple
+    GROUP BY aggregations of the data table (see plan_group_query) are
+    answered with NumPy and pyarrow instead.
     """
     
-    def __init__(self, data: Union[pd.DataFrame, 'CSVData']):
+    def __init__(self, data: Union[pd.DataFrame, 'CSVData'], engine: str = 'sqlite'):
         """
         Initialize SQL processor with data.
         
         Args:
             data: DataFrame or CSVData object
+            engine: 'sqlite' or 'duckdb'
         """
+        if engine not in SQL_ENGINES:
+            raise ValueError(f"Unknown SQL engine '{engine}'. Choose from {SQL_ENGINES}")
+        if engine == 'duckdb' and not DUCKDB_AVAILABLE:
+            raise ImportError("The duckdb engine requires duckdb: pip install dataprocessing[fast]")
+        self.engine = engine
+        
+        # The processor never modifies the data, so a shallow copy is enough
+        # to keep later column changes on the caller's frame out of the tables
         if hasattr(data, 'df'):
             # CSVData object
-            self.df = data.df.copy()
+            self.df = data.df.copy(deep=False)
         else:
             # DataFrame
-            self.df = data.copy()
+            self.df = data.copy(deep=False)
         
-        self._temp_db = None
         self._connection = None
+        self._views = set()
+        # Tables for the Polars engine, built on first use
+        self._tables = {'data': self.df}
+        self._polars_context = None
+        self._modified = False
+        # Set while the processor is cached by a CSVData object: leaving a
+        # with block then keeps it open for the next query
+        self._shared = False
+        # Number of with blocks currently using the processor
+        self._entered = 0
         self._setup_database()
     
     def _setup_database(self):
-        """Set up temporary SQLite database with the data."""
-        # Create temporary database file
-        self._temp_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
-        self._temp_db.close()
+        """Set up the database connection with the data as table 'data'."""
+        if self.engine == 'duckdb':
+            self._connection = duckdb.connect(':memory:')
+            # Sort NULLs as SQLite does: first when ascending, last when descending
+            self._connection.execute("SET default_null_order = 'nulls_first_on_asc_last_on_desc'")
+            self._register_view('data', self.df)
+            return
         
-        # Create connection
-        self._connection = sqlite3.connect(self._temp_db.name)
+        # In-memory database: it only lives as long as the processor, so there
+        # is nothing to sync to disk and nothing to clean up after close
+        self._connection = sqlite3.connect(':memory:', cached_statements=STATEMENT_CACHE_SIZE)
+        self._connection.execute("PRAGMA temp_store=MEMORY")
         
         # Write DataFrame to SQLite
-        self.df.to_sql('data', self._connection, if_exists='replace', index=False)
+        _bulk_load(self.df, self._connection, 'data')
     
-    def query(self, sql: str) -> pd.DataFrame:
+    def _register_view(self, name: str, df: pd.DataFrame) -> None:
+        """Expose a DataFrame to DuckDB as a view, replacing any table of that name."""
+        if name not in self._views:
+            self._connection.execute(f"DROP TABLE IF EXISTS {_quote_identifier(name)}")
+        self._connection.register(name, df)
+        self._views.add(name)
+    
+    def _materialize_views(self) -> None:
+        """
+        Copy registered DuckDB views into tables.
+        
+        Views over DataFrames are read-only, so this runs before statements
+        that may modify data.
+        """
+        for name in list(self._views):
+            staging = _quote_identifier(f"__{name}_staging")
+            self._connection.execute(f"CREATE TABLE {staging} AS SELECT * FROM {_quote_identifier(name)}")
+            self._connection.unregister(name)
+            self._connection.execute(f"ALTER TABLE {staging} RENAME TO {_quote_identifier(name)}")
+            self._views.discard(name)
+    
+    def register(self, name: str, df: Union[pd.DataFrame, 'pa.Table']) -> None:
+        """
+        Add a DataFrame as another table (e.g. for joins with 'data').
+        
+        DuckDB queries pandas and Arrow data in place, so registering there
+        doesn't copy; SQLite loads the rows into its database.
+        
+        Args:
+            name: Table name
+            df: DataFrame or pyarrow Table to add; an existing table with the
+                same name is replaced
+        """
+        is_arrow = PYARROW_AVAILABLE and isinstance(df, pa.Table)
+        try:
+            if self.engine == 'duckdb':
+                self._register_view(name, df)
+            else:
+                _bulk_load(df.to_pandas() if is_arrow else df, self._connection, name)
+        except Exception as e:
+            raise DataProcessingError(f"Failed to register table '{name}': {str(e)}")
+        
+        self._tables[name] = df
+        if self._polars_context is not None:
+            try:
+                self._polars_context.register(name, _polars_frame(df))
+            except _POLARS_FALLBACK_ERRORS:
+                # Rebuilt on the next Polars query, or that query falls back
+                self._polars_context = None
+    
+    def _polars_query(self, sql: str) -> 'pl.DataFrame':
+        """Run a query with Polars over LazyFrames of the registered tables."""
+        if self._polars_context is None:
+            self._polars_context = pl.SQLContext(frames={
+                name: _polars_frame(df) for name, df in self._tables.items()
+            })
+        return self._polars_context.execute(sql).collect()
+    
+    def _run(
+        self,
+        sql: str,
+        params: Optional[Union[Sequence, Dict[str, Any]]],
+        engine: Optional[str],
+        as_arrow: bool
+    ) -> Union[pd.DataFrame, 'pa.Table']:
+        """Run a query and return the result as a DataFrame or pyarrow Table."""
+        if engine not in (None, self.engine, 'polars', 'numba'):
+            raise ValueError(f"Engine '{engine}' is not available on a {self.engine} SQLProcessor")
+        if engine == 'polars':
+            if not POLARS_AVAILABLE:
+                raise ImportError("The polars engine requires polars: pip install dataprocessing[fast]")
+            # Polars has no bind parameters and doesn't see execute() changes
+            if params is None and not self._modified:
+                try:
+                    result = self._polars_query(sql)
+                    return result.to_arrow() if as_arrow else result.to_pandas()
+                except _POLARS_FALLBACK_ERRORS:
+                    # Unsupported SQL or column types; use the main engine
+                    pass
+        if engine == 'numba':
+            if not NUMBA_AVAILABLE:
+                raise ImportError("The numba engine requires numba: pip install dataprocessing[fast]")
+            # The DataFrame doesn't see execute() changes
+            if not self._modified:
+                result = _query_frame(self._tables['data'], sql, params, engine, as_arrow)
+                if result is not None:
+                    return result
+        
+        if self.engine == 'sqlite' and params is None and not self._modified:
+            # SQLite evaluates CASE row by row; simple bucketing queries are
+            # answered with np.select + groupby instead
+            data = self._tables['data']
+            plan = plan_case_group_query(sql) if isinstance(data, pd.DataFrame) else None
+            if plan is not None:
+                result = run_case_group_query(data, plan)
+                if result is not None:
+                    return pa.Table.from_pandas(result, preserve_index=False) if as_arrow else result
+            # GROUP BY aggregations run on pyarrow's multithreaded hash
+            # aggregation over the column buffers instead of SQLite's sorter
+            plan = plan_group_query(sql) if isinstance(data, pd.DataFrame) else None
+            if plan is not None:
+                result = run_group_query(data, plan, as_arrow)
+                if result is not None:
+                    return result
+        
+        try:
+            if self.engine == 'duckdb':
+                return _fetch_duckdb(self._connection.execute(_normalize_sql(sql), params), as_arrow)
+            result = pd.read_sql_query(_normalize_sql(sql), self._connection, params=params)
+            if as_arrow:
+                return pa.Table.from_pandas(result, preserve_index=False)
+            return result
+        except Exception as e:
+            raise DataProcessingError(f"SQL query failed: {str(e)}")
+    
+    def query(
+        self,
+        sql: str,
+        params: Optional[Union[Sequence, Dict[str, Any]]] = None,
+        engine: Optional[str] = None
+    ) -> pd.DataFrame:
         """
         Execute SQL query on the data.
         
         Args:
-            sql: SQL query string
+            sql: SQL query string, optionally with placeholders (see class docstring)
+            params: Values bound to the placeholders
+            engine: 'polars' or 'numba' to try that engine first, or None for the processor's engine
             
         Returns:
             DataFrame with query results
         """
+        return self._run(sql, params, engine, as_arrow=False)
+    
+    def query_many(self, sqls: List[str], engine: Optional[str] = None) -> List[pd.DataFrame]:
+        """
+        Execute several queries in one read transaction.
+        
+        All queries see the same snapshot of the data and share a single
+        BEGIN/COMMIT instead of one implicit transaction each.
+        
+        Args:
+            sqls: SQL query strings
+            engine: 'polars' or 'numba' to try that engine first, or None for the processor's engine
+            
+        Returns:
+            List of DataFrames, one per query, in order
+        """
+        self._connection.execute("BEGIN TRANSACTION")
         try:
-            result = pd.read_sql_query(sql, self._connection)
-            return result
-        except Exception as e:
-            raise DataProcessingError(f"SQL query failed: {str(e)}")
+            results = [self._run(sql, None, engine, as_arrow=False) for sql in sqls]
+        except Exception:
+            try:
+                self._connection.execute("ROLLBACK")
+            except Exception:
+                # The engine already ended the failed transaction
+                pass
+            raise
+        self._connection.execute("COMMIT")
+        return results
     
-    def execute(self, sql: str) -> None:
+    def query_arrow(
+        self,
+        sql: str,
+        params: Optional[Union[Sequence, Dict[str, Any]]] = None,
+        engine: Optional[str] = None
+    ) -> 'pa.Table':
+        """
+        Execute SQL query on the data and return a pyarrow Table.
+        
+        DuckDB and Polars hand over their columnar results without building
+        pandas objects, so this suits results that are passed on to other
+        Arrow-aware tools or registered again with register().
+        
+        Args:
+            sql: SQL query string, optionally with placeholders (see class docstring)
+            params: Values bound to the placeholders
+            engine: 'polars' or 'numba' to try that engine first, or None for the processor's engine
+            
+        Returns:
+            pyarrow Table with query results
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Arrow query results require pyarrow: pip install pyarrow")
+        return self._run(sql, params, engine, as_arrow=True)
+    
+    def execute(self, sql: str, params: Optional[Union[Sequence, Dict[str, Any]]] = None) -> None:
         """
         Execute SQL statement (INSERT, UPDATE, DELETE, etc.).
         
         Args:
-            sql: SQL statement
+            sql: SQL statement, optionally with placeholders (see class docstring)
+            params: Values bound to the placeholders
         """
+        self._modified = True
         try:
+            if self.engine == 'duckdb':
+                self._materialize_views()
+                self._connection.execute(_normalize_sql(sql), params)
+                return
             cursor = self._connection.cursor()
-            cursor.execute(sql)
+            cursor.execute(_normalize_sql(sql), params if params is not None else ())
             self._connection.commit()
         except Exception as e:
             raise DataProcessingError(f"SQL execution failed: {str(e)}")
@@ -84,7 +505,7 @@ class SQLProcessor:
         Returns:
             DataFrame with column information
         """
-        return pd.read_sql_query("PRAGMA table_info(data)", self._connection)
+        return self.query("PRAGMA table_info(data)")
     
     def get_sample_data(self, limit: int = 5) -> pd.DataFrame:
         """
@@ -102,30 +523,49 @@ class SQLProcessor:
         """Close the database connection and clean up."""
         if self._connection:
             self._connection.close()
-        
-        if self._temp_db and os.path.exists(self._temp_db.name):
-            os.unlink(self._temp_db.name)
+            self._connection = None
     
     def __enter__(self):
+        self._entered += 1
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
+        self._entered -= 1
+        if not self._shared:
+            self.close()
+    
+    @property
+    def reusable(self) -> bool:
+        """Whether the processor is open and still holds only the original data."""
+        return self._connection is not None and not self._modified and list(self._tables) == ['data']
 
 
-def sql_query(data: Union[pd.DataFrame, 'CSVData'], query: str) -> pd.DataFrame:
+def sql_query(
+    data: Union[pd.DataFrame, 'CSVData'],
+    query: str,
+    params: Optional[Union[Sequence, Dict[str, Any]]] = None,
+    engine: str = 'sqlite'
+) -> pd.DataFrame:
     """
     Execute SQL query on data.
     
     Args:
         data: DataFrame or CSVData object
         query: SQL query string
+        params: Values bound to placeholders in the query
+        engine: 'sqlite', 'duckdb', 'polars' or 'numba'
         
     Returns:
         DataFrame with query results
     """
-    with SQLProcessor(data) as processor:
-        return processor.query(query)
+    if engine in ('polars', 'numba'):
+        # The SQLite database is only built if the engine can't run the query
+        result = _query_frame(data.df if hasattr(data, 'df') else data, query, params, engine, as_arrow=False)
+        if result is not None:
+            return result
+        engine = 'sqlite'
+    with SQLProcessor(data, engine) as processor:
+        return processor.query(query, params)
 
 
 def sql_execute(data: Union[pd.DataFrame, 'CSVData'], sql: str) -> None:
@@ -0,0 +1,1022 @@
+"""
+Vectorized execution of simple SQL queries for DataProcessing package.
+Recognizes query shapes that map directly onto NumPy/pandas operations so
+they can skip the row-at-a-time SQLite interpreter.
+"""
+
+import operator
+import pandas as pd
+import numpy as np
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+try:
+    import sqlglot
+    from sqlglot import exp
+    SQLGLOT_AVAILABLE = True
+except ImportError:
+    SQLGLOT_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Comparison operators allowed in CASE WHEN conditions
+_COMPARISONS = {
+    'LT': operator.lt,
+    'LTE': operator.le,
+    'GT': operator.gt,
+    'GTE': operator.ge,
+    'EQ': operator.eq,
+}
+
+# SQL aggregate -> pandas GroupBy aggregation
+_AGGREGATES = {
+    'Count': 'count',
+    'Avg': 'mean',
+    'Sum': 'sum',
+    'Min': 'min',
+    'Max': 'max',
+}
+
+# Query clauses the CASE fast path understands
+_CASE_QUERY_CLAUSES = {'expressions', 'from', 'from_', 'group', 'order'}
+
+# Query clauses the projection fast path understands
+_PROJECTION_QUERY_CLAUSES = {'expressions', 'from', 'from_', 'order'}
+
+# Query clauses the point lookup fast path understands
+_LOOKUP_QUERY_CLAUSES = {'expressions', 'from', 'from_', 'where'}
+
+# Query clauses the Arrow GROUP BY fast path understands
+_GROUP_QUERY_CLAUSES = {'expressions', 'from', 'from_', 'group', 'having', 'order'}
+
+# Comparison operator -> pyarrow.compute function, for HAVING
+_ARROW_COMPARISONS = {
+    'LT': 'less',
+    'LTE': 'less_equal',
+    'GT': 'greater',
+    'GTE': 'greater_equal',
+    'EQ': 'equal',
+}
+
+# SQL aggregate -> pyarrow hash aggregation
+_ARROW_AGGREGATES = {
+    'Count': 'count',
+    'Avg': 'mean',
+    'Sum': 'sum',
+    'Min': 'min',
+    'Max': 'max',
+}
+
+# Arithmetic operators allowed in projections, with their Python spelling
+_ARITHMETIC = {
+    'Add': '+',
+    'Sub': '-',
+    'Mul': '*',
+    'Div': '/',
+}
+
+# Comparison and boolean operators allowed in projected CASE conditions.
+# NOT and <> are left out: with NULL (NaN) operands SQL yields NULL where
+# Python yields True.
+_CONDITIONS = {
+    'LT': '<',
+    'LTE': '<=',
+    'GT': '>',
+    'GTE': '>=',
+    'EQ': '==',
+    'And': 'and',
+    'Or': 'or',
+}
+
+
+def _column_name(node) -> Optional[str]:
+    """Name of a plain column reference (optionally qualified with 'data')."""
+    if not isinstance(node, exp.Column) or node.table not in ('', 'data'):
+        return None
+    return node.name
+
+
+def _plan_case(case) -> Optional[Tuple[str, tuple, str]]:
+    """Plan a CASE WHEN <column> <op> <number> THEN '<label>' ... ELSE '<label>' END."""
+    default = case.args.get('default')
+    if not isinstance(default, exp.Literal) or not default.is_string:
+        return None
+    
+    column = None
+    branches = []
+    for branch in case.args.get('ifs') or []:
+        condition = branch.this
+        label = branch.args.get('true')
+        op_name = type(condition).__name__
+        if op_name not in _COMPARISONS:
+            return None
+        name = _column_name(condition.this)
+        value = condition.expression
+        if name is None or (column is not None and name != column):
+            return None
+        if not isinstance(value, exp.Literal) or value.is_string:
+            return None
+        if not isinstance(label, exp.Literal) or not label.is_string:
+            return None
+        column = name
+        branches.append((op_name, float(value.this), label.this))
+    
+    if column is None:
+        return None
+    return column, tuple(branches), default.this
+
+
+@lru_cache(maxsize=128)
+def plan_case_group_query(sql: str) -> Optional[tuple]:
+    """
+    Plan a bucketing query of the form
+        
+        SELECT CASE WHEN col < 1 THEN 'a' ... ELSE 'z' END AS bucket,
+               COUNT(*) AS n, AVG(other) AS avg_other
+        FROM data GROUP BY bucket [ORDER BY <output column> [ASC|DESC]]
+    
+    Args:
+        sql: SQL query string
+    
+    Returns:
+        Plan tuple, or None if the query has a different shape
+    """
+    if not SQLGLOT_AVAILABLE:
+        return None
+    try:
+        tree = sqlglot.parse_one(sql, read='sqlite')
+    except Exception:
+        return None
+    
+    if not isinstance(tree, exp.Select):
+        return None
+    if any(value for key, value in tree.args.items() if key not in _CASE_QUERY_CLAUSES):
+        return None
+    
+    source = tree.args.get('from_') or tree.args.get('from')
+    if source is None or not isinstance(source.this, exp.Table) or source.this.name != 'data' \
+            or source.this.args.get('db') or source.this.alias:
+        return None
+    
+    # Output columns: one aliased CASE plus aliased aggregates
+    case_plan = None
+    case_alias = None
+    outputs = []
+    for expression in tree.expressions:
+        if not isinstance(expression, exp.Alias):
+            return None
+        alias = expression.alias
+        value = expression.this
+        if isinstance(value, exp.Case):
+            if case_plan is not None:
+                return None
+            case_plan = _plan_case(value)
+            if case_plan is None:
+                return None
+            case_alias = alias
+            outputs.append((alias, None, None))
+            continue
+        
+        aggregate = _AGGREGATES.get(type(value).__name__)
+        if aggregate is None or value.args.get('distinct'):
+            return None
+        if isinstance(value.this, exp.Star):
+            if aggregate != 'count':
+                return None
+            outputs.append((alias, 'size', None))
+        else:
+            column = _column_name(value.this)
+            if column is None:
+                return None
+            outputs.append((alias, aggregate, column))
+    
+    if case_plan is None:
+        return None
+    aliases = [alias for alias, _, _ in outputs]
+    if len(set(aliases)) != len(aliases):
+        return None
+    
+    # GROUP BY the CASE alias (or the CASE expression itself)
+    group = tree.args.get('group')
+    if group is None or len(group.expressions) != 1:
+        return None
+    key = group.expressions[0]
+    if not (_column_name(key) == case_alias or (isinstance(key, exp.Case) and _plan_case(key) == case_plan)):
+        return None
+    
+    order = None
+    if tree.args.get('order') is not None:
+        ordering = tree.args['order'].expressions
+        if len(ordering) != 1:
+            return None
+        name = _column_name(ordering[0].this)
+        if name not in aliases:
+            return None
+        order = (name, bool(ordering[0].args.get('desc')))
+    
+    return case_plan, tuple(outputs), order
+
+
+def run_case_group_query(df: pd.DataFrame, plan: tuple) -> Optional[pd.DataFrame]:
+    """
+    Execute a plan from plan_case_group_query with np.select and groupby.
+    
+    Args:
+        df: DataFrame queried as table 'data'
+        plan: Plan tuple
+    
+    Returns:
+        Result DataFrame matching what SQLite returns, or None if the
+        column types need SQLite's own comparison rules
+    """
+    (case_column, branches, default), outputs, order = plan
+    
+    # GROUP BY <name> resolves to a table column before an output alias
+    case_alias = next(alias for alias, aggregate, _ in outputs if aggregate is None)
+    if case_alias in df.columns:
+        return None
+    
+    # Only numeric columns compare and aggregate like SQLite does
+    columns = [case_column] + [column for _, _, column in outputs if column is not None]
+    for column in columns:
+        if column not in df.columns:
+            return None
+        dtype = df[column].dtype
+        if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+            return None
+    
+    # Missing values fail every comparison and fall to ELSE, as in SQL
+    values = df[case_column].to_numpy(dtype=np.float64, na_value=np.nan)
+    conditions = [_COMPARISONS[op](values, threshold) for op, threshold, _ in branches]
+    labels = np.select(conditions, [label for _, _, label in branches], default=default)
+    
+    grouped = df.groupby(labels, sort=True)
+    result = {}
+    for alias, aggregate, column in outputs:
+        if aggregate is None:
+            continue
+        if aggregate == 'size':
+            result[alias] = grouped.size()
+        elif aggregate == 'sum':
+            # SUM over only NULLs is NULL
+            result[alias] = grouped[column].sum(min_count=1)
+        else:
+            result[alias] = grouped[column].agg(aggregate)
+    
+    result = pd.DataFrame(result)
+    result[case_alias] = result.index.to_numpy(dtype=object)
+    result = result[[alias for alias, _, _ in outputs]].reset_index(drop=True)
+    
+    if order is not None:
+        name, descending = order
+        # SQLite sorts NULLs first in ascending order and last in descending order
+        result = result.sort_values(name, ascending=not descending, kind='stable',
+                                    na_position='last' if descending else 'first')
+        result = result.reset_index(drop=True)
+    return result
+
+
+def _plan_expression(node) -> Optional[tuple]:
+    """Lower a numeric SQL expression to a hashable tuple tree."""
+    if isinstance(node, exp.Paren):
+        return _plan_expression(node.this)
+    if isinstance(node, exp.Column):
+        name = _column_name(node)
+        return None if name is None else ('column', name)
+    if isinstance(node, exp.Literal):
+        if node.is_string:
+            return None
+        value = float(node.this)
+        return ('number', int(value) if value.is_integer() and '.' not in node.this else value)
+    if isinstance(node, exp.Neg):
+        operand = _plan_expression(node.this)
+        return None if operand is None else ('neg', operand)
+    
+    op = _ARITHMETIC.get(type(node).__name__)
+    if op is None:
+        return None
+    left = _plan_expression(node.this)
+    right = _plan_expression(node.expression)
+    if left is None or right is None:
+        return None
+    # Only division by a non-zero constant; SQLite returns NULL for x / 0
+    if op == '/' and (right[0] != 'number' or right[1] == 0):
+        return None
+    return ('arith', op, left, right)
+
+
+def _plan_condition(node) -> Optional[tuple]:
+    """Lower a CASE WHEN condition to a hashable tuple tree."""
+    if isinstance(node, exp.Paren):
+        return _plan_condition(node.this)
+    op = _CONDITIONS.get(type(node).__name__)
+    if op is None:
+        return None
+    if op in ('and', 'or'):
+        left = _plan_condition(node.this)
+        right = _plan_condition(node.expression)
+    else:
+        left = _plan_expression(node.this)
+        right = _plan_expression(node.expression)
+    if left is None or right is None:
+        return None
+    return ('compare', op, left, right)
+
+
+def _plan_projection(node) -> Optional[tuple]:
+    """Lower one SELECT list entry (without its alias) to a tuple tree."""
+    if not isinstance(node, exp.Case):
+        return _plan_expression(node)
+    
+    # CASE WHEN <condition> THEN '<label>' ... ELSE '<label>' END
+    default = node.args.get('default')
+    if node.this is not None or not isinstance(default, exp.Literal) or not default.is_string:
+        return None
+    branches = []
+    for branch in node.args.get('ifs') or []:
+        label = branch.args.get('true')
+        if not isinstance(label, exp.Literal) or not label.is_string:
+            return None
+        condition = _plan_condition(branch.this)
+        if condition is None:
+            return None
+        branches.append((condition, label.this))
+    if not branches or len(branches) > 126:
+        return None
+    return ('case', tuple(branches), default.this)
+
+
+def _referenced_columns(node: tuple) -> Tuple[str, ...]:
+    """Column names a tuple tree reads, in first-use order."""
+    if node[0] == 'column':
+        return (node[1],)
+    if node[0] == 'number':
+        return ()
+    if node[0] == 'case':
+        children = [condition for condition, _ in node[1]]
+    else:
+        children = [child for child in node[1:] if isinstance(child, tuple)]
+    
+    columns = []
+    for child in children:
+        for name in _referenced_columns(child):
+            if name not in columns:
+                columns.append(name)
+    return tuple(columns)
+
+
+@lru_cache(maxsize=128)
+def plan_projection_query(sql: str) -> Optional[tuple]:
+    """
+    Plan a row-wise projection of the form
+        
+        SELECT col, col * 0.1 AS bonus,
+               CASE WHEN age < 30 THEN 'Young' ... ELSE 'Senior' END AS stage
+        FROM data [ORDER BY <column> [ASC|DESC]]
+    
+    Args:
+        sql: SQL query string
+    
+    Returns:
+        Plan tuple, or None if the query has a different shape
+    """
+    if not SQLGLOT_AVAILABLE:
+        return None
+    try:
+        tree = sqlglot.parse_one(sql, read='sqlite')
+    except Exception:
+        return None
+    
+    if not isinstance(tree, exp.Select):
+        return None
+    if any(value for key, value in tree.args.items() if key not in _PROJECTION_QUERY_CLAUSES):
+        return None
+    
+    source = tree.args.get('from_') or tree.args.get('from')
+    if source is None or not isinstance(source.this, exp.Table) or source.this.name != 'data' \
+            or source.this.args.get('db') or source.this.alias:
+        return None
+    
+    projections = []
+    for expression in tree.expressions:
+        if isinstance(expression, exp.Alias):
+            alias = expression.alias
+            node = _plan_projection(expression.this)
+        else:
+            # Unaliased expressions are named after their SQL text
+            alias = _column_name(expression)
+            node = None if alias is None else ('column', alias)
+        if node is None or (node[0] != 'column' and not _referenced_columns(node)):
+            return None
+        projections.append((alias, node))
+    
+    aliases = [alias for alias, _ in projections]
+    if len(set(aliases)) != len(aliases):
+        return None
+    
+    order = None
+    if tree.args.get('order') is not None:
+        ordering = tree.args['order'].expressions
+        if len(ordering) != 1:
+            return None
+        name = _column_name(ordering[0].this)
+        if name is None:
+            return None
+        order = (name, bool(ordering[0].args.get('desc')))
+    
+    return tuple(projections), order
+
+
+def _scalar_source(node: tuple, arguments: Dict[str, str]) -> str:
+    """Python source for one row of a numeric expression or condition."""
+    kind = node[0]
+    if kind == 'column':
+        return f"{arguments[node[1]]}[i]"
+    if kind == 'number':
+        return repr(node[1])
+    if kind == 'neg':
+        return f"(-{_scalar_source(node[1], arguments)})"
+    _, op, left, right = node
+    return f"({_scalar_source(left, arguments)} {op} {_scalar_source(right, arguments)})"
+
+
+def _result_dtype(node: tuple, dtypes: Dict[str, np.dtype]) -> Optional[np.dtype]:
+    """NumPy dtype of a numeric expression, or None if SQLite would differ."""
+    kind = node[0]
+    if kind == 'column':
+        return dtypes[node[1]]
+    if kind == 'number':
+        return np.dtype(np.int64 if isinstance(node[1], int) else np.float64)
+    if kind == 'neg':
+        return _result_dtype(node[1], dtypes)
+    
+    left = _result_dtype(node[2], dtypes)
+    right = _result_dtype(node[3], dtypes)
+    if left is None or right is None:
+        return None
+    result = np.result_type(left, right)
+    # SQLite divides integers with truncation; leave that to SQLite
+    if node[1] == '/' and result.kind != 'f':
+        return None
+    return result
+
+
+@lru_cache(maxsize=256)
+def _compile_projection(node: tuple, input_dtypes: Tuple[str, ...]):
+    """
+    Compile a projection tuple tree to a parallel Numba kernel.
+    
+    Compiled kernels are cached by expression tree and input dtypes, so
+    repeated queries using the same expression skip the JIT warm-up.
+    
+    Args:
+        node: Tuple tree from _plan_projection
+        input_dtypes: dtype name of each referenced column, in _referenced_columns order
+    
+    Returns:
+        Kernel taking the referenced column arrays and returning a new array,
+        or None if the expression needs SQLite's own semantics
+    """
+    columns = _referenced_columns(node)
+    arguments = {name: f"c{i}" for i, name in enumerate(columns)}
+    dtypes = {name: np.dtype(dtype) for name, dtype in zip(columns, input_dtypes)}
+    
+    if node[0] == 'case':
+        # Branch index per row; labels are attached once after the loop
+        out_dtype = np.dtype(np.int8)
+        body = []
+        for code, (condition, _) in enumerate(node[1]):
+            keyword = 'if' if code == 0 else 'elif'
+            body.append(f"        {keyword} {_scalar_source(condition, arguments)}:")
+            body.append(f"            out[i] = {code}")
+        body.append("        else:")
+        body.append(f"            out[i] = {len(node[1])}")
+    else:
+        out_dtype = _result_dtype(node, dtypes)
+        if out_dtype is None:
+            return None
+        body = [f"        out[i] = {_scalar_source(node, arguments)}"]
+    
+    source = '\n'.join([
+        f"def kernel({', '.join(arguments.values())}):",
+        "    n = c0.shape[0]",
+        f"    out = np.empty(n, dtype=np.{out_dtype.name})",
+        "    for i in prange(n):",
+        *body,
+        "    return out",
+    ])
+    namespace = {'np': np, 'prange': prange}
+    exec(source, namespace)
+    return njit(parallel=True)(namespace['kernel'])
+
+
+def _value_kind(series: pd.Series) -> Optional[str]:
+    """
+    'number' or 'text' for columns SQL engines return unchanged, else None.
+    
+    Booleans, dates and other types come back from SQLite converted, so
+    queries on them are left to the engine.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Dictionary-encoded text comes back from SQL as plain strings
+        if dtype.categories.inferred_type != 'string':
+            return None
+        return 'text'
+    if pd.api.types.is_bool_dtype(dtype):
+        return None
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'number'
+    if pd.api.types.is_string_dtype(dtype):
+        return 'text'
+    return None
+
+
+def _kernel_input(series: pd.Series) -> Optional[np.ndarray]:
+    """int64 or float64 array for a numeric column (NULLs as NaN)."""
+    dtype = series.dtype
+    if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return None
+    if pd.api.types.is_integer_dtype(dtype) and not series.hasnans:
+        return series.to_numpy(dtype=np.int64)
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def run_projection_query(
+    df: pd.DataFrame,
+    plan: tuple,
+    as_arrow: bool = False
+) -> Optional[Union[pd.DataFrame, 'pa.Table']]:
+    """
+    Execute a plan from plan_projection_query with compiled Numba kernels.
+    
+    Args:
+        df: DataFrame queried as table 'data'
+        plan: Plan tuple
+        as_arrow: Return a pyarrow Table, with CASE results as dictionary arrays
+    
+    Returns:
+        Query result, or None if the column types need SQLite's own rules
+    """
+    projections, order = plan
+    
+    inputs = {}
+    outputs = {}
+    labels = {}
+    for alias, node in projections:
+        if node[0] == 'column':
+            if node[1] not in df.columns:
+                return None
+            if _value_kind(df[node[1]]) is None:
+                return None
+            # Copied so the result doesn't share memory with the frame; the
+            # reordering below copies anyway
+            outputs[alias] = df[node[1]].to_numpy(copy=order is None)
+            continue
+        
+        columns = _referenced_columns(node)
+        for name in columns:
+            if name not in inputs:
+                if name not in df.columns:
+                    return None
+                inputs[name] = _kernel_input(df[name])
+            if inputs[name] is None:
+                return None
+        kernel = _compile_projection(node, tuple(inputs[name].dtype.name for name in columns))
+        if kernel is None:
+            return None
+        try:
+            outputs[alias] = kernel(*(inputs[name] for name in columns))
+        except Exception:
+            return None
+        if node[0] == 'case':
+            labels[alias] = np.array([label for _, label in node[1]] + [node[2]], dtype=object)
+    
+    if order is not None:
+        name, descending = order
+        if name in outputs:
+            key = outputs[name]
+            key = labels[name][key] if name in labels else key
+        elif name in df.columns:
+            key = df[name].to_numpy()
+        else:
+            return None
+        try:
+            # SQLite sorts NULLs first in ascending order and last in descending order
+            positions = pd.Series(key).sort_values(
+                ascending=not descending, kind='stable',
+                na_position='last' if descending else 'first'
+            ).index.to_numpy()
+        except TypeError:
+            # Mixed types compare by SQLite's type ordering
+            return None
+        outputs = {alias: values[positions] for alias, values in outputs.items()}
+    
+    if as_arrow:
+        return pa.table({
+            alias: pa.DictionaryArray.from_arrays(values, labels[alias].tolist()) if alias in labels
+            else pa.array(values, from_pandas=True)
+            for alias, values in outputs.items()
+        })
+    for alias, values in labels.items():
+        outputs[alias] = values[outputs[alias]]
+    return pd.DataFrame(outputs, copy=False)
+
+
+def _lookup_value(node) -> Optional[tuple]:
+    """('value', v) for a number or string literal, ('param', key) for a placeholder."""
+    if isinstance(node, exp.Placeholder):
+        return ('param', node.this)
+    if isinstance(node, exp.Literal) and node.is_string:
+        return ('value', node.this)
+    number = _plan_expression(node)
+    if number is None:
+        return None
+    if number[0] == 'number':
+        return ('value', number[1])
+    if number[0] == 'neg' and number[1][0] == 'number':
+        return ('value', -number[1][1])
+    return None
+
+
+@lru_cache(maxsize=128)
+def plan_point_lookup(sql: str) -> Optional[tuple]:
+    """
+    Plan an equality lookup of the form
+        
+        SELECT * | col [AS alias], ... FROM data WHERE col = <literal | ?>
+    
+    Args:
+        sql: SQL query string
+    
+    Returns:
+        Plan tuple, or None if the query has a different shape
+    """
+    if not SQLGLOT_AVAILABLE:
+        return None
+    try:
+        tree = sqlglot.parse_one(sql, read='sqlite')
+    except Exception:
+        return None
+    
+    if not isinstance(tree, exp.Select):
+        return None
+    if any(value for key, value in tree.args.items() if key not in _LOOKUP_QUERY_CLAUSES):
+        return None
+    
+    source = tree.args.get('from_') or tree.args.get('from')
+    if source is None or not isinstance(source.this, exp.Table) or source.this.name != 'data' \
+            or source.this.args.get('db') or source.this.alias:
+        return None
+    
+    where = tree.args.get('where')
+    if where is None or not isinstance(where.this, exp.EQ):
+        return None
+    left, right = where.this.this, where.this.expression
+    if _column_name(left) is None:
+        left, right = right, left
+    key_column = _column_name(left)
+    value = _lookup_value(right)
+    if key_column is None or value is None:
+        return None
+    
+    if len(tree.expressions) == 1 and isinstance(tree.expressions[0], exp.Star):
+        outputs = None
+    else:
+        outputs = []
+        for expression in tree.expressions:
+            alias = expression.alias if isinstance(expression, exp.Alias) else None
+            column = _column_name(expression.this if alias else expression)
+            if column is None:
+                return None
+            outputs.append((alias or column, column))
+        if len({alias for alias, _ in outputs}) != len(outputs):
+            return None
+        outputs = tuple(outputs)
+    
+    return outputs, key_column, value
+
+
+def build_lookup_index(series: pd.Series) -> Optional[Dict[Any, np.ndarray]]:
+    """
+    Map each value of a column to the positions of the rows holding it.
+    
+    Args:
+        series: Column to index
+    
+    Returns:
+        Dictionary of value -> int64 row positions (missing values are left
+        out, as NULL = x never matches), or None if the column can't be
+        looked up with SQL equality semantics
+    """
+    kind = _value_kind(series)
+    if kind is None:
+        return None
+    index = series.groupby(series, sort=False, observed=True).indices
+    if kind == 'text' and not all(isinstance(value, str) for value in index):
+        # Mixed-type columns compare by SQLite's type affinity rules
+        return None
+    return index
+
+
+def run_point_lookup(
+    df: pd.DataFrame,
+    plan: tuple,
+    params: Optional[Union[Sequence, Dict[str, Any]]],
+    index_for: Callable[[str], Optional[Dict[Any, np.ndarray]]]
+) -> Optional[pd.DataFrame]:
+    """
+    Execute a plan from plan_point_lookup with a prebuilt value index.
+    
+    Args:
+        df: DataFrame queried as table 'data'
+        plan: Plan tuple
+        params: Values bound to the query's placeholder
+        index_for: Returns the (cached) build_lookup_index result for a column
+    
+    Returns:
+        Result DataFrame, or None if the query needs the SQL engine
+    """
+    outputs, key_column, (source, value) = plan
+    if source == 'param':
+        if value is None and isinstance(params, (list, tuple)) and len(params) == 1:
+            value = params[0]
+        elif value is not None and isinstance(params, dict) and value in params:
+            value = params[value]
+        else:
+            return None
+    elif params:
+        return None
+    
+    if key_column not in df.columns or not df.columns.is_unique:
+        return None
+    columns = list(df.columns) if outputs is None else [column for _, column in outputs]
+    if any(column not in df.columns or _value_kind(df[column]) is None for column in columns):
+        return None
+    
+    # Only compare like with like; SQL engines would convert between them
+    kind = _value_kind(df[key_column])
+    is_number = isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+    if not ((kind == 'number' and is_number) or (kind == 'text' and isinstance(value, str))):
+        return None
+    index = index_for(key_column)
+    if index is None:
+        return None
+    
+    positions = index.get(value, np.empty(0, dtype=np.int64))
+    # Rows first: selecting the columns first would copy them in full
+    result = df.iloc[positions].iloc[:, [df.columns.get_loc(column) for column in columns]]
+    result = result.reset_index(drop=True)
+    for column in result.columns:
+        if isinstance(result[column].dtype, pd.CategoricalDtype):
+            result[column] = result[column].astype(object)
+    if outputs is not None:
+        result.columns = [alias for alias, _ in outputs]
+    return result
+
+
+def _plan_aggregate(node) -> Optional[Tuple[str, Optional[str]]]:
+    """(function, column) for an aggregate call; column is None for COUNT(*)."""
+    function = _ARROW_AGGREGATES.get(type(node).__name__)
+    if function is None or node.args.get('distinct'):
+        return None
+    if isinstance(node.this, exp.Star):
+        return (function, None) if function == 'count' else None
+    column = _column_name(node.this)
+    return None if column is None else (function, column)
+
+
+@lru_cache(maxsize=128)
+def plan_group_query(sql: str) -> Optional[tuple]:
+    """
+    Plan an aggregation of the form
+        
+        SELECT key, ..., COUNT(*) AS n, AVG(col) AS avg_col, ...
+        FROM data GROUP BY key, ...
+        [HAVING <aggregate> <op> <number> [AND ...]]
+        [ORDER BY <output column | aggregate> [ASC|DESC], ...]
+    
+    Aggregates must be aliased, as SQLite names unaliased ones after their
+    original SQL text.
+    
+    Args:
+        sql: SQL query string
+    
+    Returns:
+        Plan tuple, or None if the query has a different shape
+    """
+    if not SQLGLOT_AVAILABLE:
+        return None
+    try:
+        tree = sqlglot.parse_one(sql, read='sqlite')
+    except Exception:
+        return None
+    
+    if not isinstance(tree, exp.Select):
+        return None
+    if any(value for key, value in tree.args.items() if key not in _GROUP_QUERY_CLAUSES):
+        return None
+    
+    source = tree.args.get('from_') or tree.args.get('from')
+    if source is None or not isinstance(source.this, exp.Table) or source.this.name != 'data' \
+            or source.this.args.get('db') or source.this.alias:
+        return None
+    
+    group = tree.args.get('group')
+    if group is None or not group.expressions:
+        return None
+    keys = []
+    for expression in group.expressions:
+        column = _column_name(expression)
+        if column is None:
+            return None
+        keys.append(column)
+    
+    # Aggregates are computed once each, whether they are selected or only
+    # used by HAVING / ORDER BY
+    aggregates = []
+    
+    def aggregate_ref(node) -> Optional[tuple]:
+        aggregate = _plan_aggregate(node)
+        if aggregate is None:
+            return None
+        if aggregate not in aggregates:
+            aggregates.append(aggregate)
+        return ('aggregate', aggregates.index(aggregate))
+    
+    outputs = []
+    for expression in tree.expressions:
+        alias = expression.alias if isinstance(expression, exp.Alias) else None
+        node = expression.this if alias else expression
+        column = _column_name(node)
+        if column is not None:
+            if column not in keys:
+                return None
+            outputs.append((alias or column, ('key', column)))
+            continue
+        ref = aggregate_ref(node) if alias else None
+        if ref is None:
+            return None
+        outputs.append((alias, ref))
+    
+    names = [name for name, _ in outputs]
+    if len(set(names)) != len(names):
+        return None
+    # GROUP BY / ORDER BY names that are both a column and an output alias
+    # resolve differently across engines
+    refs = dict(outputs)
+    if any(refs.get(key, ('key', key)) != ('key', key) for key in keys):
+        return None
+    
+    having = []
+    if tree.args.get('having') is not None:
+        conditions = [tree.args['having'].this]
+        while conditions:
+            condition = conditions.pop()
+            if isinstance(condition, exp.And):
+                conditions.extend([condition.expression, condition.this])
+                continue
+            op_name = type(condition).__name__
+            if op_name not in _COMPARISONS:
+                return None
+            left = condition.this
+            ref = refs.get(_column_name(left)) if _column_name(left) is not None else aggregate_ref(left)
+            value = _lookup_value(condition.expression)
+            if ref is None or ref[0] != 'aggregate' or value is None or value[0] != 'value' \
+                    or isinstance(value[1], str):
+                return None
+            having.append((ref, op_name, value[1]))
+    
+    order = []
+    if tree.args.get('order') is not None:
+        for ordering in tree.args['order'].expressions:
+            name = _column_name(ordering.this)
+            if name is not None:
+                ref = refs.get(name) or (('key', name) if name in keys else None)
+            else:
+                ref = aggregate_ref(ordering.this)
+            if ref is None:
+                return None
+            order.append((ref, bool(ordering.args.get('desc'))))
+    
+    return tuple(keys), tuple(aggregates), tuple(outputs), tuple(having), tuple(order)
+
+
+def _arrow_column(series: pd.Series, kind: str) -> Optional['pa.Array']:
+    """Arrow array of a number or text column (NULLs and NaN as nulls)."""
+    try:
+        array = pa.array(series, from_pandas=True)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    if kind == 'text':
+        return array if pa.types.is_string(array.type) or pa.types.is_large_string(array.type) else None
+    return array if pa.types.is_integer(array.type) or pa.types.is_floating(array.type) else None
+
+
+def _may_overflow(array: 'pa.Array') -> bool:
+    """Whether summing any subset of an integer array could leave the int64 range."""
+    if len(array) == 0 or array.null_count == len(array):
+        return False
+    bounds = pc.min_max(array)
+    largest = max(abs(bounds['min'].as_py()), abs(bounds['max'].as_py()))
+    return largest * len(array) > np.iinfo(np.int64).max
+
+
+def run_group_query(
+    df: pd.DataFrame,
+    plan: tuple,
+    as_arrow: bool = False
+) -> Optional[Union[pd.DataFrame, 'pa.Table']]:
+    """
+    Execute a plan from plan_group_query with pyarrow's hash aggregation.
+    
+    Args:
+        df: DataFrame queried as table 'data'
+        plan: Plan tuple
+        as_arrow: Return a pyarrow Table instead of a DataFrame
+    
+    Returns:
+        Result matching what SQLite returns, or None if the column types need
+        SQLite's own comparison rules
+    """
+    if not PYARROW_AVAILABLE:
+        return None
+    keys, aggregates, outputs, having, order = plan
+    
+    # Keys and aggregated columns get positional names so that the same
+    # column can be both, and the aggregate output names can't collide
+    columns = {}
+    for i, key in enumerate(keys):
+        if key not in df.columns:
+            return None
+        kind = _value_kind(df[key])
+        array = None if kind is None else _arrow_column(df[key], kind)
+        if array is None:
+            return None
+        columns[f'k{i}'] = array
+    
+    aggregations = []
+    aggregate_names = []
+    for i, (function, column) in enumerate(aggregates):
+        if column is None:
+            # COUNT(*) counts the rows of each group, nulls included
+            aggregations.append(('k0', 'count', pc.CountOptions(mode='all')))
+            aggregate_names.append('k0_count')
+            continue
+        if column not in df.columns:
+            return None
+        # Only numbers aggregate the same way in SQLite and Arrow
+        series = df[column]
+        array = _arrow_column(series, 'number') if _value_kind(series) == 'number' else None
+        if array is None:
+            return None
+        if function in ('sum', 'mean') and pa.types.is_integer(array.type) and _may_overflow(array):
+            # Arrow's integer sums wrap around; SQLite raises "integer overflow"
+            return None
+        columns[f'v{i}'] = array
+        aggregations.append((f'v{i}', function))
+        aggregate_names.append(f'v{i}_{function}')
+    
+    grouped = pa.table(columns).group_by([f'k{i}' for i in range(len(keys))]).aggregate(aggregations)
+    
+    def column_of(ref: tuple) -> str:
+        if ref[0] == 'key':
+            return f'k{keys.index(ref[1])}'
+        return aggregate_names[ref[1]]
+    
+    if having:
+        # NULL comparisons are dropped by the filter, as in SQL
+        mask = None
+        for ref, op_name, value in having:
+            condition = getattr(pc, _ARROW_COMPARISONS[op_name])(grouped[column_of(ref)], value)
+            mask = condition if mask is None else pc.and_(mask, condition)
+        grouped = grouped.filter(mask)
+    
+    # SQLite returns groups in key order; ORDER BY is applied on top of it.
+    # Stable sorts from the last sort key to the first give each key its own
+    # NULL placement (first when ascending, last when descending, as SQLite).
+    sort_keys = list(order) + [(('key', key), False) for key in keys]
+    for ref, descending in reversed(sort_keys):
+        indices = pc.array_sort_indices(
+            grouped[column_of(ref)],
+            order='descending' if descending else 'ascending',
+            null_placement='at_end' if descending else 'at_start'
+        )
+        grouped = grouped.take(indices)
+    
+    result = pa.table({name: grouped[column_of(ref)] for name, ref in outputs})
+    return result if as_arrow else result.to_pandas()
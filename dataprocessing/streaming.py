@@ -0,0 +1,205 @@
+"""
+Streaming CSV access for DataProcessing package.
+Queries CSV files batch by batch instead of loading them into memory.
+"""
+
+import codecs
+import pandas as pd
+from pathlib import Path
+from typing import Union, List, Dict, Any, Optional, Sequence, Iterator
+from .core import CSVData
+from .exceptions import DataProcessingError, FileReadError
+from .sql import _fetch_duckdb, _normalize_sql
+from .utils import detect_encoding, detect_delimiter, validate_file_path
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+# Bytes at the start of the file that column types are inferred from
+SCHEMA_SAMPLE_BYTES = 8 << 20
+
+
+class StreamingCSVData:
+    """
+    A CSV file that is read in record batches on demand.
+    
+    Nothing is parsed when the object is created. sql() streams the file
+    through DuckDB, so only one batch (plus whatever the query itself keeps,
+    such as groups or sort runs) is held in memory at a time; head() parses
+    only the first batches; the row count is computed on first use.
+    
+    Column types are inferred once from the first SCHEMA_SAMPLE_BYTES of the
+    file (pyarrow's streaming reader would use only the first batch) and
+    then fixed for every batch. Columns without any value in that sample are
+    read as text, and empty text fields are missing values, as with load().
+    A later value that doesn't fit its column's type raises FileReadError.
+    """
+    
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        encoding: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        block_size: Optional[int] = None
+    ):
+        """
+        Initialize a streaming CSV source.
+        
+        Args:
+            file_path: Path to the CSV file (optionally .gz compressed)
+            encoding: File encoding (auto-detected if None)
+            delimiter: CSV delimiter (auto-detected if None)
+            block_size: Bytes of CSV parsed per record batch (pyarrow's default if None)
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Streaming loads require pyarrow: pip install pyarrow")
+        
+        self.file_path = Path(file_path)
+        try:
+            validate_file_path(self.file_path)
+            self.encoding = encoding or detect_encoding(self.file_path)
+            self.delimiter = delimiter or detect_delimiter(self.file_path, self.encoding)
+        except Exception as e:
+            raise FileReadError(self.file_path, e)
+        self.block_size = block_size
+        
+        self._num_rows = None
+        self._schema = None
+        self._connection = None
+    
+    def _open(self, block_size: Optional[int], column_types: Optional['pa.Schema'] = None) -> 'pa.RecordBatchReader':
+        """Open a batch reader at the start of the file."""
+        # pyarrow skips a UTF-8 BOM itself; ASCII is valid UTF-8
+        encoding = self.encoding
+        if codecs.lookup(encoding).name in ('utf-8', 'utf-8-sig', 'ascii'):
+            encoding = 'utf8'
+        read_options = pa_csv.ReadOptions(encoding=encoding)
+        if block_size:
+            read_options.block_size = block_size
+        
+        try:
+            source = pa.input_stream(str(self.file_path), compression='detect')
+            return pa_csv.open_csv(source, read_options=read_options,
+                                   parse_options=pa_csv.ParseOptions(delimiter=self.delimiter),
+                                   convert_options=pa_csv.ConvertOptions(column_types=column_types,
+                                                                         strings_can_be_null=True))
+        except Exception as e:
+            raise FileReadError(self.file_path, e)
+    
+    def _reader(self) -> 'pa.RecordBatchReader':
+        """Open a new batch reader at the start of the file, with the file's schema."""
+        return self._open(self.block_size, self.schema)
+    
+    def _batches(self) -> Iterator['pa.RecordBatch']:
+        """Read the file's record batches, reporting values that don't parse as FileReadError."""
+        reader = self._reader()
+        try:
+            yield from reader
+        except pa.ArrowInvalid as e:
+            raise FileReadError(self.file_path, e)
+    
+    @property
+    def schema(self) -> 'pa.Schema':
+        """Arrow schema of the file, inferred from its first SCHEMA_SAMPLE_BYTES."""
+        if self._schema is None:
+            inferred = self._open(max(self.block_size or 0, SCHEMA_SAMPLE_BYTES)).schema
+            # A column that is empty in the sample is typed null, which fails
+            # on its first value further down
+            self._schema = pa.schema([
+                field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                for field in inferred
+            ])
+        return self._schema
+    
+    @property
+    def columns(self) -> List[str]:
+        """Get the column names."""
+        return self.schema.names
+    
+    @property
+    def shape(self) -> tuple:
+        """Get the shape of the data (rows, columns); counting rows reads the file once."""
+        return len(self), len(self.columns)
+    
+    def __len__(self) -> int:
+        """Get the number of rows, counting them on first use."""
+        if self._num_rows is None:
+            self._num_rows = sum(batch.num_rows for batch in self._batches())
+        return self._num_rows
+    
+    def __repr__(self) -> str:
+        """String representation without reading the whole file."""
+        return f"StreamingCSVData(file_path='{self.file_path}', columns={len(self.columns)})"
+    
+    def head(self, n: int = 5) -> pd.DataFrame:
+        """Get the first n rows, reading only as many batches as needed."""
+        batches = []
+        rows = 0
+        for batch in self._batches():
+            batches.append(batch)
+            rows += batch.num_rows
+            if rows >= n:
+                break
+        return pa.Table.from_batches(batches, schema=self.schema).slice(0, n).to_pandas()
+    
+    def iter_batches(self) -> Iterator[pd.DataFrame]:
+        """Yield the file as a sequence of DataFrames, one per record batch."""
+        for batch in self._batches():
+            yield batch.to_pandas()
+    
+    def sql(self, query: str, params: Optional[Union[Sequence, Dict[str, Any]]] = None) -> CSVData:
+        """
+        Execute a SQL query over the file as table 'data'.
+        
+        The file is streamed through DuckDB batch by batch. Each query reads
+        the file again, so nothing is cached between queries.
+        
+        Args:
+            query: SQL query string, with ? or $name placeholders
+            params: Values bound to the placeholders
+        
+        Returns:
+            CSVData object with query results
+        """
+        if not DUCKDB_AVAILABLE:
+            raise ImportError("Streaming SQL queries require duckdb: pip install dataprocessing[fast]")
+        if self._connection is None:
+            self._connection = duckdb.connect(':memory:')
+        
+        # A batch reader can only be scanned once, so each query gets its own
+        self._connection.register('data', self._reader())
+        try:
+            result = _fetch_duckdb(self._connection.execute(_normalize_sql(query), params), as_arrow=False)
+        except Exception as e:
+            raise DataProcessingError(f"SQL query failed: {str(e)}")
+        finally:
+            self._connection.unregister('data')
+        return CSVData._wrap(result)
+    
+    def load(self) -> CSVData:
+        """Read the whole file into memory as a CSVData object."""
+        table = pa.Table.from_batches(self._batches(), schema=self.schema)
+        self._num_rows = table.num_rows
+        return CSVData._wrap(table.to_pandas())
+    
+    def close(self):
+        """Close the DuckDB connection used by sql()."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
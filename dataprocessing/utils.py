@@ -3,12 +3,14 @@ Utility functions for DataProcessing package.
 """
 
 import os
+import codecs
 import gzip
 import zipfile
 import chardet
 from pathlib import Path
 from typing import Optional, Union, List, Dict, Any
 import pandas as pd
+import numpy as np
 
 
 def detect_encoding(file_path: Union[str, Path], sample_size: int = 10000) -> str:
@@ -25,8 +27,20 @@ def detect_encoding(file_path: Union[str, Path], sample_size: int = 10000) -> st
     try:
         with open(file_path, 'rb') as f:
             raw_data = f.read(sample_size)
-            result = chardet.detect(raw_data)
-            return result['encoding'] or 'utf-8'
+        
+        # Most files are UTF-8 (or plain ASCII), which the pyarrow CSV reader
+        # decodes natively; checking that is much cheaper than chardet
+        if raw_data.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        try:
+            # final=False tolerates a multi-byte character cut off by the sample
+            codecs.getincrementaldecoder('utf-8')().decode(raw_data, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+        
+        result = chardet.detect(raw_data)
+        return result['encoding'] or 'utf-8'
     except Exception:
         return 'utf-8'
 
@@ -255,6 +269,123 @@ def get_column_statistics(df: pd.DataFrame, column: str) -> Dict[str, Any]:
     return stats
 
 
+def _is_numpy_numeric(dtype) -> bool:
+    """Whether a dtype is a NumPy integer or float dtype (not bool or a nullable extension dtype)."""
+    return isinstance(dtype, np.dtype) and dtype.kind in 'iuf'
+
+
+def get_group_statistics(df: pd.DataFrame, by: str, columns: List[str]) -> pd.DataFrame:
+    """
+    Get mean, min, max and count of numeric columns per group.
+    
+    The group key is factorized once and every column is reduced over the
+    sorted group boundaries in a single scan, instead of one pass per
+    aggregate function.
+    
+    Args:
+        df: Pandas DataFrame
+        by: Column to group by
+        columns: Numeric columns to summarize
+        
+    Returns:
+        DataFrame indexed by group with (column, statistic) columns
+    """
+    for column in [by] + list(columns):
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' not found")
+    
+    codes, uniques = pd.factorize(df[by], sort=True)
+    
+    # Rows with a missing key are dropped, as with DataFrame.groupby
+    valid = np.flatnonzero(codes >= 0)
+    if df[by].is_monotonic_increasing:
+        # Already grouped, so no sort is needed
+        order = valid
+    else:
+        order = valid[np.argsort(codes[valid], kind='stable')]
+    sorted_codes = codes[order]
+    index = pd.Index(uniques, name=by)
+    
+    if len(order) == 0:
+        return pd.DataFrame(index=index)
+    
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    sizes = np.diff(np.r_[starts, len(order)])
+    
+    stats = {}
+    for column in columns:
+        if not _is_numpy_numeric(df[column].dtype):
+            # Nullable and other extension dtypes keep pandas' result types
+            grouped = df[column].groupby(df[by], sort=True, observed=True).agg(['mean', 'min', 'max', 'count'])
+            for statistic in ('mean', 'min', 'max', 'count'):
+                stats[(column, statistic)] = grouped[statistic].reindex(index).array
+            continue
+        
+        values = df[column].to_numpy()[order]
+        
+        if np.issubdtype(values.dtype, np.integer):
+            counts = sizes
+            sums = np.add.reduceat(values, starts)
+            minimums = np.minimum.reduceat(values, starts)
+            maximums = np.maximum.reduceat(values, starts)
+        else:
+            values = values.astype(float)
+            present = ~np.isnan(values)
+            counts = np.add.reduceat(present.astype(np.int64), starts)
+            sums = np.add.reduceat(np.where(present, values, 0.0), starts)
+            # fmin/fmax skip NaN unless the whole group is missing
+            minimums = np.fmin.reduceat(values, starts)
+            maximums = np.fmax.reduceat(values, starts)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+        
+        stats[(column, 'mean')] = means
+        stats[(column, 'min')] = minimums
+        stats[(column, 'max')] = maximums
+        stats[(column, 'count')] = counts
+    
+    return pd.DataFrame(stats, index=index)
+
+
+def get_group_sums(df: pd.DataFrame, by: str, column: str) -> Dict[Any, Any]:
+    """
+    Get the sum of a column per group.
+    
+    When the group column is already sorted, groups are contiguous and are
+    summed in one linear pass over the group boundaries, without hashing.
+    Otherwise a regular pandas groupby is used. Sorting by the key once
+    (e.g. with sort_by) makes later aggregations on that key take the fast path.
+    
+    Args:
+        df: Pandas DataFrame
+        by: Column to group by
+        column: Column to sum
+        
+    Returns:
+        Dictionary mapping each group to its sum
+    """
+    for name in [by, column]:
+        if name not in df.columns:
+            raise ValueError(f"Column '{name}' not found")
+    
+    keys = df[by]
+    values = df[column]
+    
+    if len(keys) == 0 or not keys.is_monotonic_increasing or not _is_numpy_numeric(values.dtype):
+        return values.groupby(keys, observed=True).sum().to_dict()
+    
+    key_values = keys.to_numpy()
+    starts = np.flatnonzero(np.r_[True, key_values[1:] != key_values[:-1]])
+    
+    values = values.to_numpy()
+    if np.issubdtype(values.dtype, np.floating):
+        values = np.where(np.isnan(values), 0.0, values)
+    sums = np.add.reduceat(values, starts)
+    
+    return dict(zip(key_values[starts].tolist(), sums.tolist()))
+
+
 def sanitize_column_name(name: str) -> str:
     """
     Sanitize a column name for safe use.
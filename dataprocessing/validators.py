@@ -3,12 +3,16 @@ Data validation and cleaning functions for DataProcessing package.
 """
 
 import re
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional, Union, Callable
 from .exceptions import ValidationError, DataTypeError
 
 
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
 def validate_email(email: str) -> bool:
     """
     Validate email format.
@@ -22,8 +26,7 @@ def validate_email(email: str) -> bool:
     if pd.isna(email) or email == '':
         return False
     
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, str(email)))
+    return bool(EMAIL_PATTERN.match(str(email)))
 
 
 def validate_phone(phone: str) -> bool:
@@ -155,6 +158,79 @@ def validate_categorical(series: pd.Series, allowed_values: List[Any]) -> bool:
     return unique_values.issubset(allowed_set)
 
 
+def validate_email_batch(series: pd.Series) -> pd.Series:
+    """
+    Validate email format for every value in a Series.
+    
+    Args:
+        series: Pandas Series of email strings
+        
+    Returns:
+        Boolean Series aligned with the input, True for valid emails
+    """
+    return _email_mask(series)
+
+
+def _email_mask(series: pd.Series) -> pd.Series:
+    """Vectorized validate_email over a Series."""
+    return series.notna() & series.astype(str).str.match(EMAIL_PATTERN)
+
+
+def _phone_mask(series: pd.Series) -> pd.Series:
+    """Vectorized validate_phone over a Series."""
+    digit_counts = series.astype(str).str.count(r'\d')
+    return series.notna() & digit_counts.between(7, 15)
+
+
+def _date_mask(series: pd.Series, format: Optional[str] = None) -> pd.Series:
+    """Vectorized validate_date over a Series."""
+    if format is None:
+        # Without a format each value may use a different layout
+        return series.apply(validate_date)
+    parsed = pd.to_datetime(series, format=format, errors='coerce')
+    return series.notna() & parsed.notna()
+
+
+def _numeric_mask(series: pd.Series, min_val: Optional[float] = None, max_val: Optional[float] = None) -> pd.Series:
+    """Vectorized validate_numeric over a Series."""
+    values = pd.to_numeric(series, errors='coerce')
+    mask = values.notna()
+    if min_val is not None:
+        mask &= values >= min_val
+    if max_val is not None:
+        mask &= values <= max_val
+    return mask
+
+
+def _length_mask(series: pd.Series, min_length: Optional[int] = None, max_length: Optional[int] = None) -> pd.Series:
+    """Vectorized validate_string_length over a Series."""
+    lengths = series.astype(str).str.len()
+    mask = series.notna()
+    if min_length is not None:
+        mask &= lengths >= min_length
+    if max_length is not None:
+        mask &= lengths <= max_length
+    return mask
+
+
+def _invalid_categories(series: pd.Series, allowed_values: List[Any]) -> set:
+    """Get the values of a Series that are not in the allowed categories."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Check each category once instead of every row
+        categories = series.cat.categories
+        codes = series.cat.codes.to_numpy()
+        used = np.bincount(codes[codes >= 0], minlength=len(categories)) > 0
+        return set(categories[used & ~categories.isin(allowed_values)])
+    
+    invalid = series.notna() & ~series.isin(allowed_values)
+    return set(series[invalid].unique())
+
+
+def _invalid_rows(series: pd.Series, valid: pd.Series) -> List[Any]:
+    """Get the index labels of rows where the validity mask is False."""
+    return series.index[~valid.to_numpy(dtype=bool)].tolist()
+
+
 def validate_dataframe(
     df: pd.DataFrame,
     rules: Dict[str, Dict[str, Any]]
@@ -191,9 +267,8 @@ def validate_dataframe(
                 
                 elif rule_type == 'email':
                     if rule_params:
-                        invalid_emails = series[~series.apply(validate_email)]
-                        if not invalid_emails.empty:
-                            invalid_indices = invalid_emails.index.tolist()
+                        invalid_indices = _invalid_rows(series, _email_mask(series))
+                        if invalid_indices:
                             column_errors.append(
                                 ValidationError(f"Column '{column}' has {len(invalid_indices)} invalid emails", 
                                               column=column, row=invalid_indices)
@@ -201,9 +276,8 @@ def validate_dataframe(
                 
                 elif rule_type == 'phone':
                     if rule_params:
-                        invalid_phones = series[~series.apply(validate_phone)]
-                        if not invalid_phones.empty:
-                            invalid_indices = invalid_phones.index.tolist()
+                        invalid_indices = _invalid_rows(series, _phone_mask(series))
+                        if invalid_indices:
                             column_errors.append(
                                 ValidationError(f"Column '{column}' has {len(invalid_indices)} invalid phone numbers", 
                                               column=column, row=invalid_indices)
@@ -211,9 +285,8 @@ def validate_dataframe(
                 
                 elif rule_type == 'date':
                     format_param = rule_params.get('format') if isinstance(rule_params, dict) else None
-                    invalid_dates = series[~series.apply(lambda x: validate_date(x, format_param))]
-                    if not invalid_dates.empty:
-                        invalid_indices = invalid_dates.index.tolist()
+                    invalid_indices = _invalid_rows(series, _date_mask(series, format_param))
+                    if invalid_indices:
                         column_errors.append(
                             ValidationError(f"Column '{column}' has {len(invalid_indices)} invalid dates", 
                                           column=column, row=invalid_indices)
@@ -222,9 +295,8 @@ def validate_dataframe(
                 elif rule_type == 'numeric':
                     min_val = rule_params.get('min') if isinstance(rule_params, dict) else None
                     max_val = rule_params.get('max') if isinstance(rule_params, dict) else None
-                    invalid_nums = series[~series.apply(lambda x: validate_numeric(x, min_val, max_val))]
-                    if not invalid_nums.empty:
-                        invalid_indices = invalid_nums.index.tolist()
+                    invalid_indices = _invalid_rows(series, _numeric_mask(series, min_val, max_val))
+                    if invalid_indices:
                         column_errors.append(
                             ValidationError(f"Column '{column}' has {len(invalid_indices)} invalid numeric values", 
                                           column=column, row=invalid_indices)
@@ -233,9 +305,8 @@ def validate_dataframe(
                 elif rule_type == 'length':
                     min_len = rule_params.get('min') if isinstance(rule_params, dict) else None
                     max_len = rule_params.get('max') if isinstance(rule_params, dict) else None
-                    invalid_lengths = series[~series.apply(lambda x: validate_string_length(x, min_len, max_len))]
-                    if not invalid_lengths.empty:
-                        invalid_indices = invalid_lengths.index.tolist()
+                    invalid_indices = _invalid_rows(series, _length_mask(series, min_len, max_len))
+                    if invalid_indices:
                         column_errors.append(
                             ValidationError(f"Column '{column}' has {len(invalid_indices)} values with invalid length", 
                                           column=column, row=invalid_indices)
@@ -248,11 +319,12 @@ def validate_dataframe(
                         )
                 
                 elif rule_type == 'categorical':
-                    if isinstance(rule_params, list) and not validate_categorical(series, rule_params):
-                        invalid_values = set(series.dropna().unique()) - set(rule_params)
-                        column_errors.append(
-                            ValidationError(f"Column '{column}' has invalid values: {invalid_values}", column=column)
-                        )
+                    if isinstance(rule_params, list):
+                        invalid_values = _invalid_categories(series, rule_params)
+                        if invalid_values:
+                            column_errors.append(
+                                ValidationError(f"Column '{column}' has invalid values: {invalid_values}", column=column)
+                            )
                 
                 elif rule_type == 'custom':
                     if callable(rule_params):
@@ -275,9 +347,106 @@ def validate_dataframe(
     return errors
 
 
+# A single character class, e.g. [^\d-] or [aeiou]+
+_CHARACTER_CLASS_PATTERN = re.compile(r'\[(?:\\.|[^\]\\])+\]\+?')
+
+
+@lru_cache(maxsize=64)
+def _deletion_table(pattern: str) -> Optional[Dict[int, None]]:
+    """
+    Build a str.translate table deleting the ASCII characters a pattern matches.
+    
+    Args:
+        pattern: Regex pattern
+        
+    Returns:
+        Translation table, or None if the pattern is not a single character class
+    """
+    if not _CHARACTER_CLASS_PATTERN.fullmatch(pattern):
+        return None
+    
+    compiled = re.compile(pattern)
+    deleted = ''.join(chr(code) for code in range(128) if compiled.fullmatch(chr(code)))
+    return str.maketrans('', '', deleted)
+
+
+def _replace_value(series: pd.Series, old_val: Any, new_val: Any) -> pd.Series:
+    """
+    Replace a value in a Series, renaming the category for categorical data.
+    
+    Args:
+        series: Series to update
+        old_val: Value to replace
+        new_val: Replacement value
+        
+    Returns:
+        Series with the value replaced
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.replace(old_val, new_val)
+    
+    categories = series.cat.categories
+    if old_val not in categories:
+        return series
+    if new_val in categories:
+        return series.mask(series == old_val, new_val).cat.remove_categories([old_val])
+    return series.cat.rename_categories({old_val: new_val})
+
+
+def _is_string_extension(series: pd.Series) -> bool:
+    """Check whether a Series uses a dedicated string dtype rather than object."""
+    return series.dtype != object and pd.api.types.is_string_dtype(series.dtype)
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    """
+    Prepare a Series for string cleaning rules.
+    
+    Columns that already use a string dtype (such as pd.ArrowDtype(pa.string()))
+    are returned unchanged so that .str methods run on their native kernels;
+    other columns are converted with astype(str).
+    """
+    if _is_string_extension(series):
+        return series
+    return series.astype(str)
+
+
+def _regex_replace(series: pd.Series, pattern: str, replacement: str) -> pd.Series:
+    """
+    Replace regex matches in a string Series.
+    
+    Removing a single character class (the common "strip unwanted characters"
+    rule) is done with str.translate, which avoids running the regex engine on
+    ASCII values.
+    
+    Args:
+        series: Series of strings
+        pattern: Regex pattern
+        replacement: Replacement string
+        
+    Returns:
+        Series with replacements applied
+    """
+    if _is_string_extension(series):
+        # String extension arrays (e.g. Arrow-backed) replace natively
+        return series.str.replace(pattern, replacement, regex=True)
+    
+    compiled = re.compile(pattern)
+    
+    if replacement == '':
+        table = _deletion_table(pattern)
+        if table is not None:
+            return series.map(
+                lambda value: value.translate(table) if value.isascii() else compiled.sub('', value)
+            )
+    
+    return series.str.replace(compiled, replacement, regex=True)
+
+
 def clean_dataframe(
     df: pd.DataFrame,
-    cleaning_rules: Dict[str, Dict[str, Any]]
+    cleaning_rules: Dict[str, Dict[str, Any]],
+    inplace: bool = False
 ) -> pd.DataFrame:
     """
     Clean DataFrame based on cleaning rules.
@@ -285,11 +454,12 @@ def clean_dataframe(
     Args:
         df: DataFrame to clean
         cleaning_rules: Dictionary mapping column names to cleaning rules
+        inplace: Clean the columns of df directly instead of a copy
         
     Returns:
-        Cleaned DataFrame
+        Cleaned DataFrame (df itself when inplace is True)
     """
-    df_clean = df.copy()
+    df_clean = df if inplace else df.copy()
     
     for column, rules in cleaning_rules.items():
         if column not in df_clean.columns:
@@ -301,32 +471,50 @@ def clean_dataframe(
             
             elif rule_type == 'strip_whitespace':
                 if rule_params:
-                    df_clean[column] = df_clean[column].astype(str).str.strip()
+                    df_clean[column] = _as_text(df_clean[column]).str.strip()
             
             elif rule_type == 'lowercase':
                 if rule_params:
-                    df_clean[column] = df_clean[column].astype(str).str.lower()
+                    df_clean[column] = _as_text(df_clean[column]).str.lower()
             
             elif rule_type == 'uppercase':
                 if rule_params:
-                    df_clean[column] = df_clean[column].astype(str).str.upper()
+                    df_clean[column] = _as_text(df_clean[column]).str.upper()
+            
+            elif rule_type == 'title_case':
+                if rule_params:
+                    df_clean[column] = _as_text(df_clean[column]).str.title()
             
             elif rule_type == 'replace':
                 if isinstance(rule_params, dict):
                     for old_val, new_val in rule_params.items():
-                        df_clean[column] = df_clean[column].replace(old_val, new_val)
+                        df_clean[column] = _replace_value(df_clean[column], old_val, new_val)
             
             elif rule_type == 'regex_replace':
                 if isinstance(rule_params, dict):
                     for pattern, replacement in rule_params.items():
-                        df_clean[column] = df_clean[column].astype(str).str.replace(pattern, replacement, regex=True)
+                        df_clean[column] = _regex_replace(_as_text(df_clean[column]), pattern, replacement)
             
             elif rule_type == 'round':
                 if isinstance(rule_params, int):
                     df_clean[column] = pd.to_numeric(df_clean[column], errors='coerce').round(rule_params)
             
+            elif rule_type == 'clip':
+                if isinstance(rule_params, dict):
+                    df_clean[column] = pd.to_numeric(df_clean[column], errors='coerce').clip(
+                        lower=rule_params.get('min'), upper=rule_params.get('max')
+                    )
+            
             elif rule_type == 'custom':
-                if callable(rule_params):
+                if isinstance(rule_params, np.ufunc) and rule_params.nin == 1:
+                    if rule_params.nout == 1:
+                        # Unary NumPy ufuncs (np.abs, np.sqrt, ...) run on the whole column
+                        df_clean[column] = rule_params(df_clean[column])
+                    else:
+                        # Several outputs (np.modf, np.frexp) give a tuple per value;
+                        # apply would call the ufunc once on the whole column
+                        df_clean[column] = df_clean[column].map(rule_params)
+                elif callable(rule_params):
                     df_clean[column] = df_clean[column].apply(rule_params)
     
     return df_clean
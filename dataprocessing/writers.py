@@ -2,13 +2,22 @@
 CSV file writing functionality for DataProcessing package.
 """
 
+import datetime
 import pandas as pd
+import numpy as np
 import gzip
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Union, Dict, Any
 from .exceptions import SaveError
 from .utils import is_compressed_file
 
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
 
 def save_csv_file(
     df: pd.DataFrame,
@@ -55,6 +64,39 @@ def save_csv_file(
         raise SaveError(file_path, e)
 
 
+def save_file(df: pd.DataFrame, file_path: Union[str, Path], **kwargs) -> None:
+    """
+    Save a DataFrame in the format given by the file extension.
+    
+    .parquet files are written with pyarrow, .xlsx files with write_excel_file
+    and anything else as (optionally compressed) CSV with save_csv_file.
+    
+    Args:
+        df: Pandas DataFrame to save
+        file_path: Path where to save the file
+        **kwargs: Additional parameters for save_csv_file
+        
+    Raises:
+        SaveError: If there's an error saving the file
+    """
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+    if suffix not in ('.parquet', '.xlsx'):
+        save_csv_file(df, file_path, **kwargs)
+        return
+    
+    try:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if suffix == '.parquet':
+            df.to_parquet(file_path, index=False)
+        else:
+            write_excel_file(df, file_path)
+    except ImportError:
+        raise
+    except Exception as e:
+        raise SaveError(file_path, e)
+
+
 def _save_compressed_csv(
     df: pd.DataFrame,
     file_path: Path,
@@ -137,6 +179,121 @@ def _get_file_size(file_path: Path) -> str:
         return "Unknown size"
 
 
+# Rows converted to Python cell values at a time when writing Excel files
+EXCEL_WRITE_CHUNK_ROWS = 10_000
+
+# Cell values xlsxwriter writes natively; others are written as str(value), as to_excel does
+_EXCEL_CELL_TYPES = (str, int, float, bool, datetime.datetime, datetime.date, datetime.time, datetime.timedelta)
+
+
+def _excel_cell(value: Any) -> Any:
+    """Convert a cell value xlsxwriter can't write (list, dict, Decimal, ...) to text."""
+    if value is None or isinstance(value, _EXCEL_CELL_TYPES):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _excel_values(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Native Python cell values for a block of rows, as to_excel writes them.
+    
+    Missing values become None (written as blanks), infinities are spelled
+    out and values xlsxwriter can't write are converted to text.
+    """
+    values = df.astype(object).where(df.notna(), None)
+    for position, dtype in enumerate(df.dtypes):
+        if dtype == object:
+            values.isetitem(position, values.iloc[:, position].map(_excel_cell))
+        elif pd.api.types.is_float_dtype(dtype):
+            numbers = df.iloc[:, position].to_numpy(dtype=np.float64, na_value=np.nan)
+            infinite = np.isinf(numbers)
+            if infinite.any():
+                column = values.iloc[:, position].to_numpy(copy=True)
+                column[infinite] = np.where(numbers[infinite] > 0, 'inf', '-inf')
+                values.isetitem(position, column)
+    return values
+
+
+def write_excel_file(df: pd.DataFrame, file_path: Union[str, Path]) -> None:
+    """
+    Write a DataFrame to an .xlsx file without the index.
+    
+    With xlsxwriter installed, rows are converted EXCEL_WRITE_CHUNK_ROWS at a
+    time and streamed to disk in constant_memory mode, so memory use stays
+    flat however many rows are written. Otherwise
+    (or for MultiIndex columns) this falls back to DataFrame.to_excel.
+    
+    Args:
+        df: Pandas DataFrame to write
+        file_path: Path of the .xlsx file
+    """
+    if not XLSXWRITER_AVAILABLE or isinstance(df.columns, pd.MultiIndex):
+        try:
+            df.to_excel(file_path, index=False)
+        except ImportError:
+            raise ImportError("Excel export requires xlsxwriter or openpyxl: pip install dataprocessing[excel]")
+        return
+    
+    workbook = xlsxwriter.Workbook(str(file_path), {
+        'constant_memory': True,
+        'use_zip64': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+    })
+    try:
+        worksheet = workbook.add_worksheet('Sheet1')
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        worksheet.write_row(0, 0, [str(column) for column in df.columns], header_format)
+        # constant_memory mode only accepts cells in row order
+        for start in range(0, len(df), EXCEL_WRITE_CHUNK_ROWS):
+            values = _excel_values(df.iloc[start:start + EXCEL_WRITE_CHUNK_ROWS])
+            for row_number, row in enumerate(values.itertuples(index=False, name=None), start=start + 1):
+                worksheet.write_row(row_number, 0, row)
+    finally:
+        workbook.close()
+
+
+def _export_format(
+    df: pd.DataFrame,
+    base_path: Path,
+    format_type: str,
+    **kwargs
+) -> Optional[str]:
+    """
+    Export a DataFrame to a single format.
+    
+    Args:
+        df: Pandas DataFrame to export
+        base_path: Base path for the file (without extension)
+        format_type: Format to export to
+        **kwargs: Additional parameters for saving
+        
+    Returns:
+        Path of the written file, or None if the format is not supported
+    """
+    if format_type == 'csv':
+        file_path = base_path.with_suffix('.csv')
+        save_csv_file(df, file_path, **kwargs)
+        
+    elif format_type == 'json':
+        file_path = base_path.with_suffix('.json')
+        df.to_json(file_path, orient='records', indent=2)
+        
+    elif format_type == 'excel':
+        file_path = base_path.with_suffix('.xlsx')
+        write_excel_file(df, file_path)
+        
+    elif format_type == 'parquet':
+        file_path = base_path.with_suffix('.parquet')
+        df.to_parquet(file_path, index=False)
+        
+    else:
+        return None
+    
+    return str(file_path)
+
+
 def export_to_formats(
     df: pd.DataFrame,
     base_path: Union[str, Path],
@@ -146,6 +303,9 @@ def export_to_formats(
     """
     Export DataFrame to multiple formats.
     
+    Each format is written in its own thread, so the total time is close to
+    the slowest writer rather than the sum of all of them.
+    
     Args:
         df: Pandas DataFrame to export
         base_path: Base path for the files (without extension)
@@ -157,35 +317,29 @@ def export_to_formats(
     """
     if formats is None:
         formats = ['csv', 'json', 'excel']
+    # Each format is written once; two threads must not write the same file
+    formats = list(dict.fromkeys(formats))
     
     base_path = Path(base_path)
     exported_files = {}
     
-    for format_type in formats:
-        try:
-            if format_type == 'csv':
-                file_path = base_path.with_suffix('.csv')
-                save_csv_file(df, file_path, **kwargs)
-                exported_files['csv'] = str(file_path)
-                
-            elif format_type == 'json':
-                file_path = base_path.with_suffix('.json')
-                df.to_json(file_path, orient='records', indent=2)
-                exported_files['json'] = str(file_path)
-                
-            elif format_type == 'excel':
-                file_path = base_path.with_suffix('.xlsx')
-                df.to_excel(file_path, index=False)
-                exported_files['excel'] = str(file_path)
-                
-            elif format_type == 'parquet':
-                file_path = base_path.with_suffix('.parquet')
-                df.to_parquet(file_path, index=False)
-                exported_files['parquet'] = str(file_path)
-                
-        except Exception as e:
-            # Log the error but continue with other formats
-            print(f"Failed to export to {format_type}: {e}")
+    if not formats:
+        return exported_files
+    
+    with ThreadPoolExecutor(max_workers=len(formats)) as executor:
+        futures = {
+            format_type: executor.submit(_export_format, df, base_path, format_type, **kwargs)
+            for format_type in formats
+        }
+        
+        for format_type, future in futures.items():
+            try:
+                file_path = future.result()
+                if file_path is not None:
+                    exported_files[format_type] = file_path
+            except Exception as e:
+                # Log the error but continue with other formats
+                print(f"Failed to export to {format_type}: {e}")
     
     return exported_files
 
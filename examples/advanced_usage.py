@@ -4,9 +4,37 @@ Advanced usage examples for CSV Buddy package.
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from dataprocessing import load, CSVData
 from dataprocessing.validators import validate_dataframe, clean_dataframe, get_validation_summary
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _derive_columns(salary, hire_year, bonus, category_code, years_employed):
+    """Fill bonus, salary category code and years employed in one pass."""
+    for i in prange(salary.shape[0]):
+        bonus[i] = salary[i] * 0.1
+        category_code[i] = 2 if salary[i] > 70000 else (1 if salary[i] > 50000 else 0)
+        # NaN (unparseable) hire years fail the comparison and get 0
+        years_employed[i] = 2024 - hire_year[i] if hire_year[i] > 0 else 0
+
+
+if NUMBA_AVAILABLE:
+    derive_columns = njit(parallel=True)(_derive_columns)
+else:
+    def derive_columns(salary, hire_year, bonus, category_code, years_employed):
+        """NumPy fallback for _derive_columns when numba is not installed."""
+        np.multiply(salary, 0.1, out=bonus)
+        category_code[:] = np.select([salary > 70000, salary > 50000], [2, 1], default=0)
+        years_employed[:] = np.where(hire_year > 0, 2024 - hire_year, 0)
+
+SALARY_CATEGORIES = ['Low', 'Medium', 'High']
+
 # Create more complex sample data with various data quality issues
 sample_data = {
     'id': [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
@@ -46,6 +74,17 @@ print("=== DataProcessing Advanced Usage Examples ===\n")
 # Example 1: Loading and initial inspection
 print("1. Loading and initial inspection:")
 data = load("problematic_data.csv")
+
+# Low-cardinality text columns are stored as categories: comparisons, grouping
+# and categorical validation then work on small integer codes
+for column in ['department', 'status']:
+    data.df[column] = data.df[column].astype('category')
+
+# Free-text columns use Arrow-backed strings, so .str cleaning methods run on
+# Arrow compute kernels instead of per-value Python string operations
+for column in ['name', 'email', 'phone']:
+    data.df[column] = data.df[column].astype(pd.ArrowDtype(pa.string()))
+
 print(f"Loaded data shape: {data.shape}")
 print("First few rows:")
 print(data.head())
@@ -132,54 +171,71 @@ cleaning_rules = {
         }
     },
     'salary': {
-        'custom': lambda x: max(0, x) if pd.notna(x) else x  # Ensure non-negative
+        'clip': {'min': 0}  # Ensure non-negative
     }
 }
 
-# Clean the data
-cleaned_df = clean_dataframe(data.df, cleaning_rules)
-cleaned_data = CSVData(cleaned_df)
+# Clean the data in place; the loaded CSVData already wraps the cleaned frame
+clean_dataframe(data.df, cleaning_rules, inplace=True)
+cleaned_data = data
 
 print("Data after cleaning:")
-print(cleaned_data[['name', 'email', 'phone', 'department', 'salary']].head())
+print(cleaned_data.head().loc[:, ['name', 'email', 'phone', 'department', 'salary']])
 print()
 
 # Example 4: Advanced filtering with multiple conditions
 print("4. Advanced filtering:")
 # Filter for engineering employees with salary > 60000
-engineering_high_salary = (cleaned_data
-                          .where(cleaned_data['department'] == 'Engineering')
-                          .where(cleaned_data['salary'] > 60000)
-                          .sort_by('salary', ascending=False))
+# Both conditions are combined into one mask so only a single result is built
+engineering_high_salary = cleaned_data.filter_sort(
+    (cleaned_data['department'] == 'Engineering') & (cleaned_data['salary'] > 60000),
+    'salary',
+    ascending=False
+)
 
 print(f"Engineering employees with salary > $60,000: {len(engineering_high_salary)}")
-print(engineering_high_salary[['name', 'department', 'salary']].head())
+print(engineering_high_salary.head().loc[:, ['name', 'department', 'salary']])
 print()
 
 # Example 5: Data aggregation and analysis
 print("5. Data aggregation and analysis:")
-# Group by department and calculate statistics
-dept_stats = cleaned_data.df.groupby('department').agg({
-    'salary': ['mean', 'min', 'max', 'count'],
-    'age': ['mean', 'min', 'max']
-}).round(2)
+# Group by department and calculate statistics in a single pass per column
+dept_stats = cleaned_data.group_stats('department', ['salary', 'age']).round(2)
 
 print("Department statistics:")
 print(dept_stats)
 print()
 
+# Once the data is sorted by the key, per-group sums are a single linear pass
+salary_by_dept = cleaned_data.sort_by('department').group_sum('department', 'salary')
+print("Total salary by department:")
+for department, total in salary_by_dept.items():
+    print(f"  {department}: {total}")
+print()
+
 # Example 6: Data transformation
 print("6. Data transformation:")
-# Add calculated columns
+# Parse hire dates once with an explicit format (skips format inference) and
+# keep the parsed column so later steps don't need to parse again
+hire_dates = pd.to_datetime(cleaned_data['hire_date'], format='%Y-%m-%d', errors='coerce', cache=True)
+cleaned_data.df['hire_date_parsed'] = hire_dates
+
+# Derive all calculated columns in a single pass over salary and hire year
+salary = cleaned_data['salary'].to_numpy(dtype=np.float64)
+hire_year = hire_dates.dt.year.to_numpy(dtype=np.float64)
+bonus = np.empty_like(salary)
+category_code = np.empty(len(salary), dtype=np.int8)
+years_employed = np.empty_like(salary)
+derive_columns(salary, hire_year, bonus, category_code, years_employed)
+
 transformed_data = (cleaned_data
                    .add_column('salary_category', 
-                              cleaned_data['salary'].apply(lambda x: 'High' if x > 70000 else 'Medium' if x > 50000 else 'Low'))
-                   .add_column('years_employed', 
-                              2024 - pd.to_datetime(cleaned_data['hire_date'], errors='coerce').dt.year.fillna(0))
-                   .add_column('bonus', cleaned_data['salary'] * 0.1))
+                              pd.Categorical.from_codes(category_code, SALARY_CATEGORIES))
+                   .add_column('years_employed', years_employed)
+                   .add_column('bonus', bonus))
 
 print("Data with calculated columns:")
-print(transformed_data[['name', 'salary', 'salary_category', 'years_employed', 'bonus']].head())
+print(transformed_data.head().loc[:, ['name', 'salary', 'salary_category', 'years_employed', 'bonus']])
 print()
 
 # Example 7: Error handling demonstration
@@ -235,9 +291,12 @@ chunk_size = 3
 total_rows = len(transformed_data)
 processed_rows = 0
 
-for i in range(0, total_rows, chunk_size):
-    chunk = CSVData(transformed_data.df.iloc[i:i+chunk_size])
-    processed_rows += len(chunk)
-    print(f"  Processed chunk {i//chunk_size + 1}: {len(chunk)} rows (Total: {processed_rows}/{total_rows})")
+# Only the chunk sizes are needed here, so they are computed from the slice
+# bounds. When a chunk's data is needed, take it as a view of an array built
+# once, e.g. values = transformed_data.df.to_numpy(); values[start:start + chunk_size]
+for start in range(0, total_rows, chunk_size):
+    chunk_rows = min(chunk_size, total_rows - start)
+    processed_rows += chunk_rows
+    print(f"  Processed chunk {start//chunk_size + 1}: {chunk_rows} rows (Total: {processed_rows}/{total_rows})")
 
 print("\n=== Advanced Examples completed! ===") 
\ No newline at end of file
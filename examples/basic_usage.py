@@ -73,7 +73,7 @@ data_with_missing.df.loc[3, 'age'] = None
 cleaned = data_with_missing.fill_missing('email', 'unknown@example.com')
 cleaned = cleaned.fill_missing('age', 0)
 print("Filled missing values:")
-print(cleaned[['name', 'age', 'email']].head())
+print(cleaned.head().loc[:, ['name', 'age', 'email']])
 print()
 
 # Example 6: Chaining operations
@@ -12,6 +12,7 @@ from dataprocessing import (
     load_from_db, load_from_api, create_live_stream, 
     LiveDataManager, CSVData
 )
+from dataprocessing.live_data import json_to_dataframe
 
 print("=== DataProcessing Live Data Examples ===\n")
 
@@ -96,8 +97,7 @@ try:
     # For demonstration, we'll create a DataFrame directly
     # In real usage: data = load_from_api('https://api.example.com', '/products')
     api_data = mock_api_response()
-    df = pd.DataFrame(api_data['data'])
-    data = CSVData(df)
+    data = CSVData(json_to_dataframe(api_data))
     
     print("Data loaded from API:")
     print(data.head())
@@ -305,7 +305,7 @@ try:
     # Combine CSV and live data using SQL
     with products.sql_processor() as processor:
         # Add live sales data to the database
-        live_sales.df.to_sql('sales', processor._connection, if_exists='replace', index=False)
+        processor.register('sales', live_sales.df)
         
         # Join products with sales
         combined = processor.query("""
@@ -105,19 +105,20 @@ print("Starting real-time monitoring...")
 print("Press Ctrl+C to stop")
 
 try:
-    # Monitor for changes
-previous_count = len(teacher_data.sql("SELECT * FROM data"))
-print(f"Initial record count: {previous_count}")
-
-# In a real scenario, you would run this in a loop
-# For demonstration, we'll just show the current state
-current_count = len(teacher_data.sql("SELECT * FROM data"))
-print(f"Current record count: {current_count}")
-
-if current_count != previous_count:
-    print(f"🚨 ALERT: Record count changed by {current_count - previous_count}")
-else:
-    print("✅ No change in record count")
+    # Monitor for changes (COUNT(*) lets the engine count rows without
+    # transferring every value back into a DataFrame)
+    previous_count = teacher_data.sql("SELECT COUNT(*) AS count FROM data").df.iloc[0, 0]
+    print(f"Initial record count: {previous_count}")
+    
+    # In a real scenario, you would run this in a loop
+    # For demonstration, we'll just show the current state
+    current_count = teacher_data.sql("SELECT COUNT(*) AS count FROM data").df.iloc[0, 0]
+    print(f"Current record count: {current_count}")
+    
+    if current_count != previous_count:
+        print(f"🚨 ALERT: Record count changed by {current_count - previous_count}")
+    else:
+        print("✅ No change in record count")
         
 except KeyboardInterrupt:
     print("\nMonitoring stopped")
@@ -129,8 +130,8 @@ print("-" * 40)
 # Use context manager for automatic cleanup
 with import_live("@https://example.com/live-data.csv") as live_data:
     # Data is automatically refreshed
-teachers = live_data.sql("SELECT COUNT(*) as count FROM data")
-print(f"Total records in pool: {teachers.iloc[0]['count']}")
+    teachers = live_data.sql("SELECT COUNT(*) as count FROM data")
+    print(f"Total records in pool: {teachers.df.iloc[0]['count']}")
     
     # Get latest data
     latest = live_data.get_data()
@@ -3,7 +3,7 @@ SQL functionality examples for DataProcessing package.
 """
 
 import pandas as pd
-from dataprocessing import load, CSVData, SQLProcessor, sql_query, build_query
+from dataprocessing import load, save, CSVData, SQLProcessor, sql_query, build_query
 
 # Create sample data
 sample_data = {
@@ -18,7 +18,7 @@ sample_data = {
 
 # Create DataFrame and save as CSV
 df = pd.DataFrame(sample_data)
-df.to_csv('employee_data.csv', index=False)
+save(df, 'employee_data.csv')
 
 print("=== DataProcessing SQL Examples ===\n")
 
@@ -84,7 +84,8 @@ result = data.sql("""
     ORDER BY department, salary DESC
 """)
 print("Salary ranking by department:")
-print(result)
+# preview() formats only the first rows; use result.df.to_string() for all of them
+print(result.preview())
 print()
 
 # Example 3: Using SQLProcessor for advanced operations
@@ -104,9 +105,11 @@ with data.sql_processor() as processor:
     print(sample)
     print()
     
-    # Execute multiple queries
-    result1 = processor.query("SELECT COUNT(*) as total FROM data")
-    result2 = processor.query("SELECT DISTINCT department FROM data")
+    # Execute multiple queries in one batch
+    result1, result2 = processor.query_many([
+        "SELECT COUNT(*) as total FROM data",
+        "SELECT DISTINCT department FROM data"
+    ])
     
     print("Total count:", result1.iloc[0]['total'])
     print("Departments:", list(result2['department']))
@@ -209,7 +212,7 @@ dept_df = pd.DataFrame(dept_data)
 # Use SQLProcessor to join data
 with data.sql_processor() as processor:
     # Add department data to the database
-    dept_df.to_sql('departments', processor._connection, if_exists='replace', index=False)
+    processor.register('departments', dept_df)
     
     # Join the tables
     result = processor.query("""
@@ -8,15 +8,12 @@ try:
         requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
 except FileNotFoundError:
     requirements = [
-        "pandas>=1.5.0",
+        "pandas>=2.1.0,<3",
         "chardet>=4.0.0",
         "python-dateutil>=2.8.0",
-        "numpy>=1.21.0",
-        "openpyxl>=3.0.0",
-        "pyarrow>=7.0.0",
+        "numpy>=1.24.0,<3",
+        "pyarrow>=14.0.0",
         "requests>=2.25.0",
-        "psycopg2-binary>=2.9.0",
-        "mysql-connector-python>=8.0.0",
     ]
 
 setup(
@@ -36,17 +33,25 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
         "Topic :: Scientific/Engineering :: Information Analysis",
         "Topic :: Software Development :: Libraries :: Python Modules",
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.9",
     install_requires=requirements,
     extras_require={
-        "fast": ["polars>=0.19.0"],
+        "fast": [
+            "polars>=0.19.0",
+            "duckdb>=0.9.0",
+            "sqlglot>=20.0.0",
+            "numba>=0.57.0",
+            "adbc-driver-sqlite~=1.0",
+        ],
+        "excel": ["xlsxwriter>=3.0.0", "openpyxl>=3.0.0"],
+        "postgres": ["adbc-driver-postgresql~=1.0"],
+        "mysql": ["mysql-connector-python>=8.0.0"],
     },
     keywords="csv, data, processing, pandas, sql, live-data",
     project_urls={
@@ -6,8 +6,10 @@ import pytest
 import pandas as pd
 import tempfile
 import os
+from decimal import Decimal
 from pathlib import Path
 from dataprocessing import CSVData, load, save
+from dataprocessing import core, readers, writers
 from dataprocessing.exceptions import ColumnNotFoundError, FileReadError
 
 
@@ -53,6 +55,22 @@ class TestCSVData:
         with pytest.raises(ColumnNotFoundError):
             _ = self.csv_data['nonexistent']
     
+    def test_repr(self):
+        """Test the repr is a single line."""
+        assert repr(self.csv_data) == 'CSVData(shape=(3, 3), columns=3)'
+    
+    def test_preview(self, monkeypatch):
+        """Test the preview shows a bounded slice of the rows."""
+        text = self.csv_data.preview()
+        assert text.startswith('CSVData(shape=(3, 3), columns=3)\n')
+        assert 'Charlie' in text and 'more rows' not in text
+        
+        monkeypatch.setattr(CSVData, 'PREVIEW_ROWS', 2)
+        monkeypatch.setattr(CSVData, 'PREVIEW_COLUMNS', 1)
+        lines = self.csv_data.preview().splitlines()
+        assert 'Charlie' not in self.csv_data.preview() and 'age' not in lines[1]
+        assert lines[-2:] == ['... 1 more rows', '... 2 more columns']
+    
     def test_where_filtering(self):
         """Test where filtering."""
         filtered = self.csv_data.where(self.csv_data['age'] > 25)
@@ -64,6 +82,29 @@ class TestCSVData:
         sorted_data = self.csv_data.sort_by('age', ascending=False)
         assert list(sorted_data['name']) == ['Charlie', 'Bob', 'Alice']
     
+    def test_derived_data_is_independent(self):
+        """Test that results of transformations don't share data with the source."""
+        for derived in [self.csv_data.sort_by('age'),
+                        self.csv_data.filter_sort(self.csv_data['age'] > 0, 'age'),
+                        self.csv_data.add_column('salary', 1),
+                        self.csv_data.drop_missing(),
+                        self.csv_data.drop_duplicates()]:
+            derived.df.loc[derived.df.index[0], 'age'] = -1
+        assert list(self.csv_data['age']) == [25, 30, 35]
+    
+    def test_filter_sort(self):
+        """Test combined filtering and sorting."""
+        result = self.csv_data.filter_sort(self.csv_data['age'] > 25, 'age', ascending=False)
+        assert list(result['name']) == ['Charlie', 'Bob']
+        
+        result = self.csv_data.filter_sort(self.csv_data['age'] < 35, 'name')
+        assert list(result['name']) == ['Alice', 'Bob']
+    
+    def test_filter_sort_nonexistent_column(self):
+        """Test filter_sort with a non-existent column raises error."""
+        with pytest.raises(ColumnNotFoundError):
+            self.csv_data.filter_sort(self.csv_data['age'] > 25, 'nonexistent')
+    
     def test_select_columns(self):
         """Test column selection."""
         selected = self.csv_data.select_columns(['name', 'age'])
@@ -132,6 +173,48 @@ class TestCSVData:
         assert 'city' in profile
         assert profile['age']['dtype'] == 'int64'
     
+    def test_group_stats(self):
+        """Test grouped statistics."""
+        df = pd.DataFrame({
+            'team': ['b', 'a', 'b', None, 'a'],
+            'score': [10, 20, 30, 40, None]
+        })
+        stats = CSVData(df).group_stats('team', ['score'])
+        expected = df.groupby('team')['score'].agg(['mean', 'min', 'max', 'count'])
+        
+        assert list(stats.index) == ['a', 'b']
+        for stat in ['mean', 'min', 'max', 'count']:
+            assert list(stats[('score', stat)]) == list(expected[stat])
+    
+    def test_group_sum(self):
+        """Test group sums for sorted and unsorted keys."""
+        df = pd.DataFrame({
+            'team': ['a', 'a', 'b', 'c', 'c'],
+            'score': [1.0, None, 3.0, 4.0, 5.0]
+        })
+        expected = {'a': 1.0, 'b': 3.0, 'c': 9.0}
+        
+        assert CSVData(df).group_sum('team', 'score') == expected
+        assert CSVData(df.iloc[::-1]).group_sum('team', 'score') == expected
+    
+    def test_group_nullable_dtypes(self):
+        """Test nullable integer columns keep the types pandas groupby returns."""
+        df = pd.DataFrame({
+            'team': ['a', 'a', 'b'],
+            'score': pd.array([1, None, 3], dtype='Int64')
+        })
+        sums = CSVData(df).group_sum('team', 'score')
+        assert sums == {'a': 1, 'b': 3} and isinstance(sums['a'], int)
+        
+        stats = CSVData(df).group_stats('team', ['score'])
+        expected = df.groupby('team')[['score']].agg(['mean', 'min', 'max', 'count'])
+        pd.testing.assert_frame_equal(stats, expected)
+    
+    def test_group_stats_nonexistent_column(self):
+        """Test group_stats with a non-existent column raises error."""
+        with pytest.raises(ColumnNotFoundError):
+            self.csv_data.group_stats('city', ['nonexistent'])
+    
     def test_check_missing(self):
         """Test missing value check."""
         missing_info = self.csv_data.check_missing()
@@ -199,6 +282,147 @@ class TestLoadSave:
         finally:
             os.unlink(file_path)
     
+    def test_load_with_nrows(self):
+        """Test load with an option the pyarrow parser does not support."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            self.df.to_csv(f.name, index=False)
+            file_path = f.name
+        
+        try:
+            data = load(file_path, nrows=1)
+            assert len(data) == 1
+            assert data.columns == ['name', 'age']
+        finally:
+            os.unlink(file_path)
+    
+    @pytest.mark.parametrize('sniff_rows', [1000, 1])
+    def test_load_column_types(self, sniff_rows, monkeypatch):
+        """Test the pyarrow parser returns the same types as the pandas C parser."""
+        # With one sampled row the dates are only found by the full read
+        monkeypatch.setattr(readers, '_SNIFF_ROWS', sniff_rows)
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write("name,hired,clock_in,badge\n")
+            f.write("Bob,,,3\n")
+            f.write("Alice,2020-01-15,2020-01-15 09:00:00,\n")
+            f.write(",2021-03-01,2021-03-01T08:30:00Z,7\n")
+            file_path = f.name
+        
+        try:
+            data = load(file_path)
+            pd.testing.assert_frame_equal(data.df, pd.read_csv(file_path, engine='c'))
+            assert list(data.df['hired'].iloc[1:]) == ['2020-01-15', '2021-03-01']
+        finally:
+            os.unlink(file_path)
+    
+    def test_load_cache(self, monkeypatch):
+        """Test repeated loads reuse the parsed file until it changes."""
+        reads = []
+        read_csv_file = core.read_csv_file
+        
+        def counting_read(*args, **kwargs):
+            reads.append(args)
+            return read_csv_file(*args, **kwargs)
+        
+        monkeypatch.setattr(core, 'read_csv_file', counting_read)
+        load.clear_cache()
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as f:
+            file_path = f.name
+        self.df.to_csv(file_path, index=False)
+        
+        try:
+            first = load(file_path)
+            first.df.loc[0, 'age'] = -1
+            second = load(file_path)
+            # Each load gets its own copy of the cached data
+            assert list(second['age']) == [25, 30]
+            assert len(reads) == 1
+            
+            self.df.assign(age=[26, 31]).to_csv(file_path, index=False)
+            os.utime(file_path, ns=(0, os.stat(file_path).st_mtime_ns + 1))
+            assert list(load(file_path)['age']) == [26, 31]
+            assert len(reads) == 2
+            
+            monkeypatch.setenv('DATAPROCESSING_LOAD_CACHE', '0')
+            load(file_path)
+            assert len(reads) == 3
+        finally:
+            load.clear_cache()
+            os.unlink(file_path)
+    
+    def test_load_parquet_cache(self, monkeypatch):
+        """Test loads of large files read a Parquet copy instead of parsing the CSV."""
+        pytest.importorskip('pyarrow')
+        reads = []
+        read_csv_file = core.read_csv_file
+        
+        def counting_read(*args, **kwargs):
+            reads.append(args)
+            return read_csv_file(*args, **kwargs)
+        
+        monkeypatch.setattr(core, 'read_csv_file', counting_read)
+        monkeypatch.setattr(core, 'PARQUET_CACHE_MIN_BYTES', 0)
+        load.clear_cache()
+        df = pd.DataFrame({
+            'name': [f'person{i}' for i in range(40)],
+            'team': ['b', 'a', None, 'c'] * 10,
+            'salary': [1000.5 * i for i in range(40)],
+        })
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as f:
+            file_path = f.name
+        parquet_path = file_path + core.PARQUET_CACHE_SUFFIX
+        df.to_csv(file_path, index=False)
+        
+        try:
+            first = load(file_path).df
+            assert os.path.exists(parquet_path)
+            load.clear_cache()
+            pd.testing.assert_frame_equal(load(file_path).df, first)
+            load.clear_cache()
+            assert load(file_path, columns=['salary', 'team']).columns == ['salary', 'team']
+            assert len(reads) == 1
+            
+            # Copies made with other read options or from an older file aren't used
+            load.clear_cache()
+            assert len(load(file_path, nrows=3)) == 3
+            assert len(reads) == 2
+            load.clear_cache()
+            df.head(2).to_csv(file_path, index=False)
+            os.utime(file_path, ns=(0, os.stat(file_path).st_mtime_ns + 1))
+            assert len(load(file_path)) == 2
+            assert len(reads) == 3
+            
+            load.clear_cache()
+            load(file_path, cache=False)
+            monkeypatch.setenv('DATAPROCESSING_PARQUET_CACHE', '0')
+            load(file_path)
+            assert len(reads) == 5
+        finally:
+            load.clear_cache()
+            os.unlink(file_path)
+            if os.path.exists(parquet_path):
+                os.unlink(parquet_path)
+    
+    def test_load_dictionary_encoding(self):
+        """Test low-cardinality text columns are loaded as categoricals."""
+        df = pd.DataFrame({
+            'name': [f'person{i}' for i in range(40)],
+            'team': ['b', 'a', None, 'c'] * 10,
+        })
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as f:
+            file_path = f.name
+        df.to_csv(file_path, index=False)
+        
+        try:
+            data = load(file_path, categorize=True)
+            assert data.df['name'].dtype == object
+            assert list(data.df['team'].cat.categories) == ['a', 'b', 'c']
+            assert data.df['team'].astype(object).equals(df['team'])
+            assert list(data.sort_by('team')['team'])[:3] == ['a', 'a', 'a']
+            assert data.fill_missing('team', 'none')['team'].isna().sum() == 0
+            assert load(file_path).df['team'].dtype == object
+        finally:
+            os.unlink(file_path)
+    
     def test_save_function(self):
         """Test save function."""
         csv_data = CSVData(self.df)
@@ -212,6 +436,71 @@ class TestLoadSave:
         finally:
             os.unlink(file_path)
     
+    def test_save_formats(self):
+        """Test save picks the format from the extension and round-trips values."""
+        pytest.importorskip('pyarrow')
+        df = self.df.copy()
+        df.loc[0, 'name'] = 'Smith, "Al"'
+        scores = df.assign(score=[1.0, None])
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            save(df, os.path.join(tmp_dir, 'people.csv'))
+            save(scores, os.path.join(tmp_dir, 'scores.csv'))
+            save(CSVData(scores), os.path.join(tmp_dir, 'scores.parquet'))
+            
+            assert pd.read_csv(os.path.join(tmp_dir, 'people.csv')).equals(df)
+            # Files are written exactly as to_csv writes them
+            for frame in (df, df[['age']].assign(rank=[2, 1])):
+                save(frame, os.path.join(tmp_dir, 'saved.csv'))
+                frame.to_csv(os.path.join(tmp_dir, 'expected.csv'), index=False)
+                with open(os.path.join(tmp_dir, 'saved.csv'), 'rb') as saved, \
+                        open(os.path.join(tmp_dir, 'expected.csv'), 'rb') as expected:
+                    assert saved.read() == expected.read()
+            with open(os.path.join(tmp_dir, 'scores.csv')) as f:
+                # Floats keep to_csv's formatting
+                assert f.read().splitlines()[1].endswith(',1.0')
+            assert pd.read_parquet(os.path.join(tmp_dir, 'scores.parquet')).equals(scores)
+    
+    def test_export_formats(self):
+        """Test exporting to multiple formats."""
+        csv_data = CSVData(self.df)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            base_path = os.path.join(tmp_dir, 'export')
+            exported = csv_data.export(base_path, formats=['csv', 'json', 'unknown', 'csv'])
+            
+            assert list(exported) == ['csv', 'json']
+            assert pd.read_csv(exported['csv']).equals(self.df)
+            assert pd.read_json(exported['json']).equals(self.df)
+    
+    def test_export_excel(self, monkeypatch):
+        """Test exporting to Excel keeps every cell."""
+        pytest.importorskip('openpyxl')
+        # One row per chunk
+        monkeypatch.setattr(writers, 'EXCEL_WRITE_CHUNK_ROWS', 1)
+        df = self.df.assign(salary=[50000.0, float('inf')])
+        df.loc[0, 'name'] = None
+        df.loc[1, 'age'] = None
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            exported = CSVData(df).export(os.path.join(tmp_dir, 'export'), formats=['excel'])
+            assert pd.read_excel(exported['excel']).equals(df)
+            
+            # Lists, dicts and Decimals are written as text, as to_excel writes them
+            objects = pd.DataFrame({'value': [[1, 2], {'k': 1}, Decimal('1.5')]})
+            exported = CSVData(objects).export(os.path.join(tmp_dir, 'objects'), formats=['excel'])
+            assert list(pd.read_excel(exported['excel'])['value']) == ['[1, 2]', "{'k': 1}", '1.5']
+    
+    def test_load_encodings(self):
+        """Test loading UTF-8 (with and without BOM) and Latin-1 files."""
+        df = pd.DataFrame({'name': ['José', 'Zoë'], 'age': [25, 30]})
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for encoding in ['utf-8', 'utf-8-sig', 'latin-1']:
+                path = os.path.join(tmp_dir, f'{encoding}.csv')
+                df.to_csv(path, index=False, encoding=encoding)
+                assert load(path).df.equals(df)
+    
     def test_load_nonexistent_file(self):
         """Test loading non-existent file raises error."""
         with pytest.raises(FileReadError):
@@ -255,5 +544,70 @@ class TestChaining:
         assert list(result['name']) == ['Charlie', 'Bob', 'Diana']
 
 
+class TestStreamingLoad:
+    """Test cases for load(..., streaming=True)."""
+    
+    def setup_method(self):
+        """Set up a test file."""
+        self.df = pd.DataFrame({
+            'team': ['a', 'b', 'c'] * 400,
+            'score': range(1200),
+        })
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as f:
+            self.file_path = f.name
+        self.df.to_csv(self.file_path, index=False)
+    
+    def teardown_method(self):
+        """Remove the test file."""
+        os.unlink(self.file_path)
+    
+    def test_streaming_access(self):
+        """Test head, shape and batches are read from the file on demand."""
+        pytest.importorskip('pyarrow')
+        data = load(self.file_path, streaming=True, block_size=1024)
+        
+        assert data.columns == ['team', 'score']
+        assert data.head(3).equals(self.df.head(3))
+        assert data.shape == (1200, 2)
+        batches = list(data.iter_batches())
+        assert len(batches) > 1
+        assert pd.concat(batches, ignore_index=True).equals(self.df)
+        assert data.load().df.equals(self.df)
+    
+    def test_streaming_sql(self):
+        """Test SQL queries stream the file through DuckDB, once per query."""
+        pytest.importorskip('duckdb')
+        with load(self.file_path, streaming=True, block_size=1024) as data:
+            result = data.sql("SELECT team, COUNT(*) AS n FROM data WHERE score >= ? GROUP BY team ORDER BY team", [600])
+            again = data.sql("SELECT MAX(score) AS top FROM data")
+        
+        assert isinstance(result, CSVData)
+        assert list(result['team']) == ['a', 'b', 'c']
+        assert list(result['n']) == [200, 200, 200]
+        assert again['top'].iloc[0] == 1199
+    
+    def test_streaming_types(self, monkeypatch):
+        """Test columns empty in the type sample and values that don't fit their column."""
+        pytest.importorskip('pyarrow')
+        from dataprocessing import streaming
+        monkeypatch.setattr(streaming, 'SCHEMA_SAMPLE_BYTES', 1024)
+        df = self.df.assign(note=[None] * 1100 + ['late'] * 100)
+        df.to_csv(self.file_path, index=False)
+        
+        data = load(self.file_path, streaming=True, block_size=1024)
+        assert len(data) == 1200
+        assert list(data.load()['note'].dropna().unique()) == ['late']
+        if streaming.DUCKDB_AVAILABLE:
+            total = data.sql("SELECT SUM(score) AS total FROM data WHERE note = 'late'")
+            assert total.df['total'].dtype == 'int64'
+        
+        df.assign(score=list(range(1199)) + ['unknown']).to_csv(self.file_path, index=False)
+        data = load(self.file_path, streaming=True, block_size=1024)
+        with pytest.raises(FileReadError):
+            len(data)
+        with pytest.raises(FileReadError):
+            data.load()
+
+
 if __name__ == '__main__':
-    pytest.main([__file__]) 
\ No newline at end of file
+    pytest.main([__file__]) 
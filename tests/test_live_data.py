@@ -0,0 +1,190 @@
+"""
+Unit tests for DataProcessing live data functionality.
+"""
+
+import os
+import pytest
+import sqlite3
+import tempfile
+import pandas as pd
+from datetime import datetime, timedelta
+from dataprocessing import CSVData, EnhancedLiveData
+from dataprocessing.exceptions import DataProcessingError
+from dataprocessing.live_data import RealTimeDataStream, SQLiteConnector, _split_database_uri, json_to_dataframe
+
+
+class TestRealTimeDataStream:
+    """Test cases for RealTimeDataStream buffering."""
+    
+    def setup_method(self):
+        """Set up test data."""
+        self.start_time = datetime(2024, 1, 1)
+        self.records = [
+            {'symbol': 'AAPL', 'price': 150.0 + i, 'volume': 1000 + i}
+            for i in range(5)
+        ]
+    
+    def _fill(self, stream, records):
+        for i, record in enumerate(records):
+            stream._add_record(record, self.start_time + timedelta(seconds=i))
+    
+    def test_ring_buffer_keeps_latest_records(self):
+        """Test the ring buffer keeps the latest records in order."""
+        stream = RealTimeDataStream(lambda: None, max_records=3)
+        self._fill(stream, self.records)
+        
+        df = stream.get_latest_data()
+        assert list(df.columns) == ['symbol', 'price', 'volume', 'timestamp']
+        assert list(df['volume']) == [1002, 1003, 1004]
+        assert df['timestamp'].iloc[-1] == self.start_time + timedelta(seconds=4)
+        assert str(df['volume'].dtype) == 'int64'
+    
+    def test_mismatched_record_falls_back_to_list(self):
+        """Test records with a different layout keep all data."""
+        stream = RealTimeDataStream(lambda: None, max_records=3)
+        self._fill(stream, self.records[:2] + [{'symbol': 'AAPL', 'price': 'n/a', 'volume': 1}])
+        
+        df = stream.get_latest_data()
+        assert list(df['price']) == [150.0, 151.0, 'n/a']
+        assert list(df['volume']) == [1000, 1001, 1]
+    
+    def test_unbounded_stream(self):
+        """Test streams without max_records keep every record."""
+        stream = RealTimeDataStream(lambda: None)
+        self._fill(stream, self.records)
+        
+        assert len(stream.get_latest_data()) == 5
+    
+    def test_clear_buffer(self):
+        """Test clearing the buffer."""
+        stream = RealTimeDataStream(lambda: None, max_records=3)
+        self._fill(stream, self.records)
+        stream.clear_buffer()
+        
+        assert stream.get_latest_data().empty
+
+
+
+class TestJsonToDataFrame:
+    """Test cases for converting API responses to DataFrames."""
+    
+    def test_records_with_different_keys(self):
+        """Test records with different keys produce the union of columns."""
+        records = [{'id': 1, 'name': 'A'}, {'id': 2, 'price': 9.5}]
+        df = json_to_dataframe({'data': records})
+        expected = pd.DataFrame(records)
+        
+        assert list(df.columns) == list(expected.columns)
+        assert list(df['id']) == [1, 2]
+        assert df['price'].iloc[1] == 9.5
+        assert pd.isna(df['name'].iloc[1])
+    
+    def test_mixed_value_types(self):
+        """Test fields with mixed types fall back to pandas inference."""
+        df = json_to_dataframe([{'value': 1}, {'value': 'text'}])
+        assert list(df['value']) == [1, 'text']
+    
+    def test_large_and_nested_values(self):
+        """Test integers beyond int64 and list fields come back as pandas builds them."""
+        assert json_to_dataframe([{'a': 2**70}])['a'].iloc[0] == 2**70
+        df = json_to_dataframe([{'tags': ['x', 'y'], 'id': 1}, {'tags': [], 'id': 2}])
+        assert df['tags'].iloc[0] == ['x', 'y']
+        assert list(df['id']) == [1, 2]
+    
+    def test_single_object(self):
+        """Test a single JSON object becomes one row."""
+        df = json_to_dataframe({'temperature': 25.5, 'humidity': 60})
+        assert df.shape == (1, 2)
+
+
+class TestEnhancedLiveDataSQL:
+    """Test cases for the persistent SQL connection of EnhancedLiveData."""
+    
+    def _live_data(self, df):
+        live = EnhancedLiveData(lambda: None)
+        live.current_data = CSVData(df)
+        return live
+    
+    def test_connection_reused_until_refresh(self):
+        """Test that queries share a connection and see refreshed data."""
+        live = self._live_data(pd.DataFrame({'region': ['N', 'S', 'N'], 'count': [1, 2, 3]}))
+        first = live.sql("SELECT SUM(count) AS total FROM teacher_data")
+        processor = live._sql_processor
+        second = live.sql("SELECT region FROM data WHERE count > 1 ORDER BY count")
+        assert first.df.iloc[0, 0] == 6
+        assert list(second.df['region']) == ['S', 'N']
+        assert live._sql_processor is processor
+        
+        live.current_data = CSVData(pd.DataFrame({'region': ['E'], 'count': [10]}))
+        assert live.sql("SELECT SUM(count) AS total FROM data").df.iloc[0, 0] == 10
+        live.close_sql()
+
+
+class TestDatabaseConnector:
+    """Test cases for database connectors."""
+    
+    def setup_method(self):
+        """Set up a test database."""
+        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
+            self.db_path = f.name
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("CREATE TABLE sales (id INTEGER, product TEXT, amount REAL)")
+        connection.executemany("INSERT INTO sales VALUES (?, ?, ?)",
+                               [(1, 'Laptop', 1200.0), (2, 'Mouse', None), (3, 'Laptop', 1100.0)])
+        connection.commit()
+        connection.close()
+    
+    def teardown_method(self):
+        """Remove the test database."""
+        os.unlink(self.db_path)
+    
+    def test_sqlite_query(self):
+        """Test SQLite queries through the connector."""
+        with SQLiteConnector(self.db_path) as db:
+            db.execute("INSERT INTO sales VALUES (4, 'Monitor', 300.0)")
+            result = db.query("SELECT product, amount FROM sales ORDER BY id")
+        
+        assert list(result['product']) == ['Laptop', 'Mouse', 'Laptop', 'Monitor']
+        assert result['amount'].isna().tolist() == [False, True, False, False]
+    
+    def test_sqlite_sees_other_writes(self):
+        """Test queries see rows committed by other connections after the first query."""
+        with SQLiteConnector(self.db_path) as db:
+            assert db.query("SELECT COUNT(*) AS n FROM sales")['n'].iloc[0] == 3
+            connection = sqlite3.connect(self.db_path)
+            connection.execute("INSERT INTO sales VALUES (4, 'Monitor', 300.0)")
+            connection.commit()
+            connection.close()
+            assert db.query("SELECT COUNT(*) AS n FROM sales")['n'].iloc[0] == 4
+            with pytest.raises(Exception, match='no such column'):
+                db.query("SELECT missing FROM sales")
+            assert db._sqlite3_connection is None
+    
+    def test_sqlite_mixed_type_column(self):
+        """Test columns holding integers and then text, as SQLite allows."""
+        connection = sqlite3.connect(self.db_path)
+        connection.executemany("INSERT INTO sales VALUES (?, ?, ?)", [(i, 'Cable', 5.0) for i in range(4, 2004)])
+        connection.execute("INSERT INTO sales VALUES ('x-1', 'Cable', 5.0)")
+        connection.commit()
+        connection.close()
+        
+        with SQLiteConnector(self.db_path) as db:
+            result = db.query("SELECT id FROM sales")
+        
+        assert len(result) == 2004
+        assert result['id'].iloc[-1] == 'x-1'
+    
+    def test_from_sql(self):
+        """Test loading a query result from a database URI."""
+        data = CSVData.from_sql(f"sqlite:///{self.db_path}",
+                                "SELECT product, SUM(amount) AS total FROM sales GROUP BY product ORDER BY product")
+        
+        assert list(data['product']) == ['Laptop', 'Mouse']
+        assert data['total'].iloc[0] == 2300.0
+        assert _split_database_uri('postgres://user@host/db') == ('postgresql', 'postgresql://user@host/db')
+        with pytest.raises(DataProcessingError):
+            _split_database_uri('oracle://host/db')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
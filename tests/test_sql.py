@@ -0,0 +1,551 @@
+"""
+Unit tests for DataProcessing SQL functionality.
+"""
+
+import pytest
+import sqlite3
+import pandas as pd
+from dataprocessing import CSVData, SQLProcessor
+from dataprocessing import sql
+from dataprocessing.sql import SQL_TEMPLATES, _bulk_load, _normalize_sql, build_query
+from dataprocessing.exceptions import DataProcessingError
+from dataprocessing.sql_vectorized import (
+    plan_case_group_query, plan_group_query, plan_point_lookup, plan_projection_query
+)
+
+
+@pytest.fixture(params=['sqlite', 'duckdb'])
+def engine(request):
+    """Run a test with each SQL engine."""
+    if request.param == 'duckdb' and not sql.DUCKDB_AVAILABLE:
+        pytest.skip("duckdb not installed")
+    return request.param
+
+
+class TestSQLProcessor:
+    """Test cases for SQLProcessor."""
+    
+    @pytest.fixture(autouse=True)
+    def use_engine(self, engine):
+        """Run every test on each SQL engine."""
+        self.engine = engine
+    
+    def setup_method(self):
+        """Set up test data."""
+        self.df = pd.DataFrame({
+            'name': ['Alice', 'Bob', 'Charlie', 'Diana'],
+            'age': [25, 30, 35, 28],
+            'department': ['Engineering', 'Sales', 'Engineering', None],
+            'salary': [50000.0, 60000.0, None, 55000.0]
+        })
+        self.csv_data = CSVData(self.df)
+    
+    def test_query(self):
+        """Test running a query."""
+        with self.csv_data.sql_processor(self.engine) as processor:
+            result = processor.query("SELECT name FROM data WHERE age > 26 ORDER BY age")
+        assert list(result['name']) == ['Diana', 'Bob', 'Charlie']
+    
+    def test_engine(self, engine):
+        """Test that SQLite is the default engine and others are chosen explicitly."""
+        with self.csv_data.sql_processor(self.engine) as processor:
+            assert processor.engine == engine
+        with SQLProcessor(self.df) as processor:
+            assert processor.engine == 'sqlite'
+        # SQLite's integer division and case-insensitive LIKE
+        result = self.csv_data.sql("SELECT age / 10 AS decade FROM data WHERE name LIKE 'a%'")
+        assert result['decade'].tolist() == [2]
+        with pytest.raises(ValueError):
+            SQLProcessor(self.df, engine='postgres')
+    
+    def test_processor_reused(self, engine):
+        """Test the processor is kept between calls until the data or its tables change."""
+        with self.csv_data.sql_processor(self.engine) as processor:
+            assert processor.query("SELECT COUNT(*) AS n FROM data")['n'].iloc[0] == 4
+        assert self.csv_data.sql_processor(self.engine) is processor
+        assert len(self.csv_data.sql("SELECT name FROM data WHERE age > 26", engine=self.engine)) == 3
+        assert self.csv_data.sql_processor(self.engine) is processor
+        
+        # Statements that modify the processor's tables aren't seen by later users
+        with self.csv_data.sql_processor(self.engine) as modified:
+            modified.execute("DELETE FROM data WHERE age > 26")
+            assert len(modified.query("SELECT * FROM data")) == 1
+        assert len(self.csv_data.sql("SELECT * FROM data", engine=self.engine)) == 4
+        
+        # So are values edited in place
+        self.csv_data.df.loc[0, 'age'] = 125
+        assert self.csv_data.sql("SELECT MAX(age) AS top FROM data", engine=self.engine)['top'].iloc[0] == 125
+        self.csv_data.df.loc[0, 'age'] = 25
+        
+        # Processors given extra tables are closed when they are replaced
+        extended = self.csv_data.sql_processor(self.engine)
+        extended.register('other', self.df)
+        self.csv_data.sql("SELECT * FROM data", engine=self.engine)
+        assert extended._connection is None
+        
+        # New columns and replaced frames are picked up
+        self.csv_data.df['bonus'] = self.csv_data.df['age'] * 10
+        assert self.csv_data.sql("SELECT MAX(bonus) AS top FROM data", engine=self.engine)['top'].iloc[0] == 350
+        self.csv_data._df = self.df.head(2)
+        assert len(self.csv_data.sql("SELECT * FROM data", engine=self.engine)) == 2
+        
+        reused = self.csv_data.sql_processor(self.engine)
+        self.csv_data.clear_sql_cache()
+        assert self.csv_data.sql_processor(self.engine) is not reused
+    
+    def test_query_params(self, engine):
+        """Test binding parameters to a query."""
+        named_sql = "SELECT name FROM data WHERE department = " + ('$dept' if engine == 'duckdb' else ':dept')
+        with self.csv_data.sql_processor(self.engine) as processor:
+            positional = processor.query("SELECT name FROM data WHERE age > ? ORDER BY age", [26])
+            named = processor.query(named_sql, {'dept': 'Sales'})
+        assert list(positional['name']) == ['Diana', 'Bob', 'Charlie']
+        assert list(named['name']) == ['Bob']
+        
+        result = self.csv_data.sql("SELECT COUNT(*) AS n FROM data WHERE salary >= ?", [55000])
+        assert result.df.iloc[0, 0] == 2
+    
+    def test_result_types_match_sqlite(self):
+        """Test integer sums and NULL ordering come back as SQLite returns them."""
+        query = """SELECT department, SUM(age) AS total_age, COUNT(*) AS n FROM data
+                   GROUP BY department ORDER BY department"""
+        connection = sqlite3.connect(':memory:')
+        _bulk_load(self.df, connection, 'data')
+        expected = pd.read_sql_query(query, connection)
+        connection.close()
+        
+        with SQLProcessor(self.df, self.engine) as processor:
+            pd.testing.assert_frame_equal(processor.query(query), expected)
+            assert processor.query_arrow(query).schema.field('total_age').type == 'int64'
+            descending = processor.query(query.replace('ORDER BY department', 'ORDER BY department DESC'))
+        assert descending['department'].isna().tolist() == [False, False, True]
+    
+    def test_normalize_sql(self):
+        """Test that only whitespace outside quotes is collapsed."""
+        assert _normalize_sql("SELECT  *\n  FROM data\tWHERE name = 'a  b'") == \
+            "SELECT * FROM data WHERE name = 'a  b'"
+        commented = "SELECT * -- all columns\nFROM data"
+        assert _normalize_sql(commented) == commented
+        assert _normalize_sql("SELECT  [first  name], `last  name`\nFROM data") == \
+            "SELECT [first  name], `last  name` FROM data"
+        assert _normalize_sql("SELECT /* it's  kept */  name FROM data WHERE name = 'a  b'") == \
+            "SELECT /* it's  kept */ name FROM data WHERE name = 'a  b'"
+        unterminated = "SELECT  name FROM data /* open"
+        assert _normalize_sql(unterminated) == unterminated
+    
+    def test_register(self):
+        """Test joining with a registered table."""
+        departments = pd.DataFrame({'department': ['Engineering', 'Sales'], 'budget': [100, 50]})
+        
+        with self.csv_data.sql_processor(self.engine) as processor:
+            processor.register('departments', departments)
+            result = processor.query("""
+                SELECT d.name, b.budget FROM data d
+                JOIN departments b ON d.department = b.department
+                ORDER BY d.name
+            """)
+        
+        assert list(result['name']) == ['Alice', 'Bob', 'Charlie']
+        assert list(result['budget']) == [100, 50, 100]
+    
+    def test_register_arrow_table(self):
+        """Test registering a pyarrow Table, including for Polars queries."""
+        pa = pytest.importorskip('pyarrow')
+        budgets = pa.table({'department': ['Engineering', 'Sales'], 'budget': [100, 50]})
+        join = ("SELECT d.name, b.budget FROM data d JOIN departments b "
+                "ON d.department = b.department ORDER BY d.name")
+        
+        with self.csv_data.sql_processor(self.engine) as processor:
+            processor.register('departments', budgets)
+            result = processor.query(join)
+            if sql.POLARS_AVAILABLE:
+                processor.query("SELECT COUNT(*) FROM data", engine='polars')
+                processor.register('departments', budgets.slice(0, 1))
+                assert list(processor.query(join, engine='polars')['budget']) == [100, 100]
+        
+        assert list(result['budget']) == [100, 50, 100]
+    
+    def test_polars_engine(self):
+        """Test Polars results match the main engine and unsupported SQL falls back."""
+        pytest.importorskip('polars')
+        grouped = ("SELECT department, COUNT(*) AS n, MAX(age) AS oldest FROM data "
+                   "WHERE age BETWEEN 25 AND 35 GROUP BY department ORDER BY n DESC, oldest")
+        with self.csv_data.sql_processor(self.engine) as processor:
+            polars_result = processor.query(grouped, engine='polars')
+            expected = processor.query(grouped)
+            # Placeholders are not supported by Polars
+            fallback = processor.query("SELECT name FROM data WHERE age > ? ORDER BY age", [26], engine='polars')
+        
+        assert polars_result.astype(object).equals(expected.astype(object))
+        assert list(fallback['name']) == ['Diana', 'Bob', 'Charlie']
+        assert list(self.csv_data.sql("SELECT name FROM data ORDER BY age DESC LIMIT 1",
+                                      engine='polars')['name']) == ['Charlie']
+
+    def test_polars_errors(self, monkeypatch):
+        """Test only Polars errors fall back and sql_query skips the database for Polars."""
+        pytest.importorskip('polars')
+        
+        def failing_query(processor, query):
+            raise RuntimeError("bug")
+        
+        monkeypatch.setattr(SQLProcessor, '_polars_query', failing_query)
+        with self.csv_data.sql_processor(self.engine) as processor:
+            with pytest.raises(RuntimeError):
+                processor.query("SELECT name FROM data", engine='polars')
+        
+        monkeypatch.setattr(SQLProcessor, '_setup_database', None)
+        result = sql.sql_query(self.csv_data, "SELECT COUNT(*) AS n FROM data", engine='polars')
+        assert result['n'].tolist() == [4]
+        
+    def test_query_arrow(self):
+        """Test Arrow results match the DataFrame results."""
+        pytest.importorskip('pyarrow')
+        grouped = "SELECT department, COUNT(*) AS n FROM data GROUP BY department ORDER BY department"
+        with self.csv_data.sql_processor(self.engine) as processor:
+            table = processor.query_arrow(grouped)
+            expected = processor.query(grouped)
+            processor.register('counts', table)
+            rejoined = processor.query("SELECT SUM(n) AS total FROM counts")
+        
+        assert table.column_names == ['department', 'n']
+        assert table.column('department').to_pylist() == expected['department'].tolist()
+        assert table.column('n').to_pylist() == expected['n'].tolist()
+        assert rejoined.iloc[0, 0] == 4
+    
+    def test_query_many(self):
+        """Test running a batch of queries."""
+        with self.csv_data.sql_processor(self.engine) as processor:
+            total, names = processor.query_many([
+                "SELECT COUNT(*) AS total FROM data",
+                "SELECT name FROM data WHERE age > 26 ORDER BY age"
+            ])
+            with pytest.raises(DataProcessingError):
+                processor.query_many(["SELECT 1", "SELECT missing FROM data"])
+            # The connection is usable after a failed batch
+            assert processor.query_many(["SELECT COUNT(*) AS n FROM data"])[0].iloc[0, 0] == 4
+        
+        assert total.iloc[0, 0] == 4
+        assert list(names['name']) == ['Diana', 'Bob', 'Charlie']
+    
+    def test_execute(self):
+        """Test modifying the data with a statement."""
+        with self.csv_data.sql_processor(self.engine) as processor:
+            processor.execute("UPDATE data SET age = age + 1 WHERE name = ?", ['Alice'])
+            result = processor.query("SELECT age FROM data WHERE name = 'Alice'")
+            info = processor.get_table_info()
+        assert result.iloc[0, 0] == 26
+        assert list(info['name']) == ['name', 'age', 'department', 'salary']
+        assert self.df.loc[0, 'age'] == 25
+
+
+class TestVectorizedCaseQuery:
+    """Test cases for the vectorized CASE ... GROUP BY path on SQLite."""
+    
+    def setup_method(self):
+        """Set up test data."""
+        self.df = pd.DataFrame({
+            'salary': [48000.0, 52000.0, None, 70000.0, 85000.0, 61000.0],
+            'age': [26, 29, 35, 41, 45, 30],
+        })
+    
+    @pytest.mark.parametrize('query', [
+        """SELECT CASE WHEN salary < 50000 THEN 'Low' WHEN salary < 70000 THEN 'Medium'
+                  ELSE 'High' END AS salary_category, COUNT(*) AS count, AVG(age) AS avg_age
+           FROM data GROUP BY salary_category ORDER BY avg_age""",
+        """SELECT CASE WHEN age >= 40 THEN 'senior' ELSE 'junior' END AS stage,
+                  SUM(salary) AS total, COUNT(salary) AS paid, MIN(salary) AS lowest
+           FROM data GROUP BY stage ORDER BY total DESC""",
+    ])
+    def test_matches_sqlite(self, query):
+        """Test the vectorized result equals SQLite's own result."""
+        pytest.importorskip('sqlglot')
+        assert plan_case_group_query(query) is not None
+        
+        with SQLProcessor(self.df, engine='sqlite') as processor:
+            result = processor.query(query)
+            expected = pd.read_sql_query(query, processor._connection)
+        
+        assert result.equals(expected)
+    
+    def test_default_engine(self, monkeypatch):
+        """Test CSVData.sql answers bucketing queries without SQLite by default."""
+        pytest.importorskip('sqlglot')
+        monkeypatch.setattr(sql.pd, 'read_sql_query', None)
+        result = CSVData(self.df).sql(
+            "SELECT CASE WHEN age < 30 THEN 'junior' ELSE 'senior' END AS stage, COUNT(*) AS n "
+            "FROM data GROUP BY stage ORDER BY stage"
+        )
+        assert result.df.to_dict('list') == {'stage': ['junior', 'senior'], 'n': [2, 4]}
+    
+    def test_alias_shadowing_column(self):
+        """Test a CASE alias named like a table column groups by the column, as in SQLite."""
+        query = ("SELECT CASE WHEN salary < 50000 THEN 'L' ELSE 'H' END AS age, COUNT(*) AS n "
+                 "FROM data GROUP BY age")
+        with SQLProcessor(self.df, engine='sqlite') as processor:
+            result = processor.query(query)
+            expected = pd.read_sql_query(query, processor._connection)
+        
+        assert len(result) == 6
+        assert result.equals(expected)
+    
+    def test_other_queries_not_planned(self):
+        """Test that queries outside the supported shape go to the SQL engine."""
+        assert plan_case_group_query("SELECT * FROM data") is None
+        assert plan_case_group_query(
+            "SELECT CASE WHEN age < 30 THEN 'a' ELSE 'b' END AS g, COUNT(*) AS n FROM data WHERE age > 1 GROUP BY g"
+        ) is None
+
+
+class TestArrowGroupQuery:
+    """Test cases for the pyarrow GROUP BY path on SQLite."""
+    
+    def setup_method(self):
+        """Set up test data."""
+        self.df = pd.DataFrame({
+            'department': ['Eng', 'Sales', 'Eng', None, 'HR', 'Sales', 'Eng'],
+            'city': pd.Categorical(['NY', 'LA', 'NY', 'LA', 'NY', 'NY', 'LA']),
+            'salary': [70000, 52000, 85000, 61000, 48000, 58000, 90000],
+            'age': [26.0, None, 35.0, 41.0, None, 30.0, 45.0],
+        })
+    
+    @pytest.mark.parametrize('query', [
+        """SELECT department, COUNT(*) AS n, AVG(salary) AS avg_salary, MAX(salary) AS top,
+                  SUM(age) AS total_age FROM data GROUP BY department""",
+        """SELECT department, city, AVG(salary) AS avg_salary, MIN(age) AS youngest
+           FROM data GROUP BY department, city""",
+        """SELECT city, COUNT(*) AS employee_count, COUNT(age) AS with_age, AVG(salary) AS avg_salary
+           FROM data GROUP BY city HAVING COUNT(*) > 3""",
+        """SELECT department AS dept, SUM(age) AS total_age FROM data GROUP BY department
+           HAVING total_age > 30 AND MIN(salary) >= 0 ORDER BY MAX(salary) DESC""",
+        """SELECT age, COUNT(*) AS n, SUM(salary) AS total FROM data GROUP BY age ORDER BY total""",
+    ])
+    def test_matches_sqlite(self, query):
+        """Test the Arrow result equals SQLite's own result."""
+        pytest.importorskip('sqlglot')
+        pytest.importorskip('pyarrow')
+        assert plan_group_query(query) is not None
+        
+        with SQLProcessor(self.df, engine='sqlite') as processor:
+            result = processor.query(query)
+            arrow_result = processor.query_arrow(query)
+            expected = pd.read_sql_query(query, processor._connection)
+        
+        pd.testing.assert_frame_equal(result, expected)
+        pd.testing.assert_frame_equal(arrow_result.to_pandas(), expected)
+    
+    def test_other_queries_not_planned(self):
+        """Test that queries outside the supported shape go to the SQL engine."""
+        pytest.importorskip('sqlglot')
+        # Unaliased aggregates are named after their SQL text
+        assert plan_group_query("SELECT city, COUNT(*) FROM data GROUP BY city") is None
+        assert plan_group_query("SELECT city, salary FROM data GROUP BY city") is None
+        assert plan_group_query("SELECT city, COUNT(*) AS n FROM data WHERE age > 1 GROUP BY city") is None
+        assert plan_group_query("SELECT city, COUNT(DISTINCT age) AS n FROM data GROUP BY city") is None
+        assert plan_group_query("SELECT city AS age, COUNT(*) AS n FROM data GROUP BY age") is None
+    
+    def test_default_engine(self, monkeypatch):
+        """Test CSVData.sql answers GROUP BY queries without SQLite by default."""
+        pytest.importorskip('sqlglot')
+        pytest.importorskip('pyarrow')
+        monkeypatch.setattr(sql.pd, 'read_sql_query', None)
+        result = CSVData(self.df).sql(
+            "SELECT city, COUNT(*) AS n, MAX(salary) AS top FROM data GROUP BY city ORDER BY city"
+        )
+        assert result.df.to_dict('list') == {'city': ['LA', 'NY'], 'n': [3, 4], 'top': [90000, 85000]}
+    
+    def test_integer_overflow(self):
+        """Test sums that could overflow int64 are left to SQLite, which reports them."""
+        pytest.importorskip('pyarrow')
+        df = pd.DataFrame({'team': ['a', 'a'], 'points': [2 ** 62, 2 ** 62]})
+        with SQLProcessor(df, engine='sqlite') as processor:
+            with pytest.raises(DataProcessingError, match='overflow'):
+                processor.query("SELECT team, SUM(points) AS total FROM data GROUP BY team")
+            assert processor.query("SELECT team, AVG(points) AS mean FROM data GROUP BY team")['mean'][0] == 2.0 ** 62
+
+
+class TestNumbaProjectionQuery:
+    """Test cases for the engine='numba' projection path."""
+    
+    def setup_method(self):
+        """Set up test data."""
+        self.df = pd.DataFrame({
+            'name': ['Alice', 'Bob', 'Charlie', 'Diana', 'Eve'],
+            'age': [25, 35, 45, 28, 39],
+            'salary': [50000.0, None, 80000.0, 55000.0, 65000.0],
+        })
+    
+    @pytest.mark.parametrize('query', [
+        """SELECT name, age, salary * 0.1 AS bonus,
+                  CASE WHEN age < 30 THEN 'Young' WHEN age < 40 THEN 'Mid-career'
+                  ELSE 'Senior' END AS career_stage
+           FROM data ORDER BY salary DESC""",
+        """SELECT -(age + 1) * 2 AS score, salary / 1000.0 AS k,
+                  CASE WHEN age > 30 AND salary >= 60000 OR age = 25 THEN 'yes' ELSE 'no' END AS flag
+           FROM data ORDER BY age""",
+    ])
+    def test_matches_engine(self, engine, query):
+        """Test the compiled result equals the main engine's result."""
+        pytest.importorskip('numba')
+        pytest.importorskip('sqlglot')
+        assert plan_projection_query(query) is not None
+        
+        with SQLProcessor(self.df, engine) as processor:
+            result = processor.query(query, engine='numba')
+            expected = processor.query(query)
+            table = processor.query_arrow(query, engine='numba')
+        
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+        assert table.column_names == list(expected.columns)
+        assert table.column(table.num_columns - 1).to_pylist() == expected.iloc[:, -1].tolist()
+    
+    def test_result_is_a_copy(self):
+        """Test editing a result leaves the source frame unchanged."""
+        pytest.importorskip('numba')
+        pytest.importorskip('sqlglot')
+        with SQLProcessor(self.df) as processor:
+            result = processor.query("SELECT name, age, age * 2 AS double FROM data", engine='numba')
+        result.loc[0, 'age'] = 999
+        assert self.df.loc[0, 'age'] == 25
+    
+    def test_fallback(self):
+        """Test that queries outside the supported shape go to the SQL engine."""
+        pytest.importorskip('numba')
+        assert plan_projection_query("SELECT * FROM data") is None
+        assert plan_projection_query("SELECT age FROM data WHERE age > 30") is None
+        
+        with SQLProcessor(self.df, engine='sqlite') as processor:
+            # SQLite divides integers with truncation
+            result = processor.query("SELECT age / 2 AS half FROM data ORDER BY age", engine='numba')
+            limited = processor.query("SELECT name FROM data ORDER BY age LIMIT 2", engine='numba')
+        
+        assert list(result['half']) == [12, 14, 17, 19, 22]
+        assert list(limited['name']) == ['Alice', 'Diana']
+
+
+class TestPointLookup:
+    """Test cases for the indexed WHERE col = value path of CSVData.sql."""
+    
+    def setup_method(self):
+        """Set up test data."""
+        self.df = pd.DataFrame({
+            'id': [1, 2, 3, 4, 5],
+            'name': ['Alice', 'Bob', 'Alice', None, 'Eve'],
+            'score': [1.5, None, 3.0, -2.0, 2.0],
+            'team': pd.Categorical(['x', 'y', 'x', 'y', 'x']),
+        })
+    
+    @pytest.mark.parametrize('query, params', [
+        ("SELECT * FROM data WHERE id = 3", None),
+        ("SELECT name, score AS s FROM data WHERE name = 'Alice'", None),
+        ("SELECT id FROM data WHERE -2 = score", None),
+        ("SELECT id, name FROM data WHERE team = ?", ['y']),
+        ("SELECT id FROM data WHERE id = ?", [5]),
+    ])
+    def test_matches_engine(self, engine, query, params, monkeypatch):
+        """Test indexed lookups return what the SQL engine returns, without using it."""
+        pytest.importorskip('sqlglot')
+        assert plan_point_lookup(query) is not None
+        with SQLProcessor(self.df, engine) as processor:
+            # DuckDB returns categoricals as ENUMs; the lookup returns plain values
+            expected = processor.query(query, params).astype(object)
+        
+        data = CSVData(self.df)
+        monkeypatch.setattr(CSVData, '_cached_processor', None)
+        result = data.sql(query, params).df.astype(object)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    
+    def test_fallback(self, engine, monkeypatch):
+        """Test lookups the index can't answer exactly go to the SQL engine."""
+        pytest.importorskip('sqlglot')
+        data = CSVData(self.df)
+        assert plan_point_lookup("SELECT * FROM data WHERE id > 3") is None
+        assert plan_point_lookup("SELECT * FROM data WHERE id = 3 LIMIT 1") is None
+        # The engine converts '3' to the column's type
+        assert list(data.sql("SELECT name FROM data WHERE id = '3'")['name']) == ['Alice']
+        assert len(data.sql("SELECT * FROM data WHERE name = 'Nobody'")) == 0
+        
+        # The index is kept between queries until the data is handed out
+        index = data._lookup_index('id')
+        assert len(data.sql("SELECT * FROM data WHERE id = 2")) == 1
+        assert data._lookup_index('id') is index
+        
+        # Values edited in place are re-indexed
+        data.df.loc[0, 'id'] = 9
+        assert len(data.sql("SELECT * FROM data WHERE id = 1")) == 0
+        assert list(data.sql("SELECT name FROM data WHERE id = 9")['name']) == ['Alice']
+        
+        # An explicit engine runs the query there
+        calls = []
+        cached_processor = CSVData._cached_processor
+        
+        def counting_processor(self, *args):
+            calls.append(args)
+            return cached_processor(self, *args)
+        
+        monkeypatch.setattr(CSVData, '_cached_processor', counting_processor)
+        assert len(data.sql("SELECT * FROM data WHERE id = 9", engine=engine)) == 1
+        assert calls == [(engine,)]
+        
+        # Replaced data is re-indexed
+        data._df = self.df.assign(id=[5, 4, 3, 2, 1])
+        assert list(data.sql("SELECT name FROM data WHERE id = 5")['name']) == ['Alice']
+
+
+class TestBuildQuery:
+    """Test cases for SQL query templates."""
+    
+    def test_matches_str_format(self):
+        """Test every template expands exactly like str.format."""
+        params = {'columns': 'name, age', 'condition': 'age > 30', 'column': 'age',
+                  'direction': 'DESC', 'group_columns': 'city', 'aggregate_functions': 'COUNT(*)',
+                  'other_table': 'departments', 'key1': 'dept', 'key2': 'id', 'limit': 10}
+        for name, template in SQL_TEMPLATES.items():
+            assert build_query(name, **params) == template.format(**params)
+            assert build_query(name, **params) == template.format(**params)
+    
+    def test_unhashable_and_missing_values(self):
+        """Test unhashable values and missing parameters behave like str.format."""
+        assert build_query('select_columns', columns=['a']) == "SELECT ['a'] FROM data"
+        # Equal values of different types format differently
+        assert [build_query('limit', limit=value) for value in (1, True, 1.0)] == \
+            ["SELECT * FROM data LIMIT 1", "SELECT * FROM data LIMIT True", "SELECT * FROM data LIMIT 1.0"]
+        with pytest.raises(KeyError):
+            build_query('filter')
+        with pytest.raises(DataProcessingError):
+            build_query('unknown')
+
+
+class TestBulkLoad:
+    """Test cases for loading DataFrames into SQLite."""
+    
+    def test_matches_to_sql(self):
+        """Test the bulk loader stores the same values and types as to_sql."""
+        df = pd.DataFrame({
+            'id': [1, 2],
+            'score': [1.5, None],
+            'active': [True, False],
+            'name': ['x', None],
+            'category': pd.Categorical(['u', 'v']),
+            'count': pd.array([1, None], dtype='Int64'),
+            'created': pd.to_datetime(['2020-01-01 00:00:00', '2020-01-02 03:04:05.123'], format='ISO8601'),
+        })
+        
+        expected = sqlite3.connect(':memory:')
+        df.to_sql('t', expected, index=False)
+        actual = sqlite3.connect(':memory:')
+        _bulk_load(df, actual, 't')
+        
+        for query in ["SELECT * FROM t", "PRAGMA table_info(t)"]:
+            assert actual.execute(query).fetchall() == expected.execute(query).fetchall()
+    
+    def test_replaces_existing_table(self):
+        """Test loading replaces an existing table."""
+        connection = sqlite3.connect(':memory:')
+        _bulk_load(pd.DataFrame({'a': [1, 2, 3]}), connection, 't')
+        _bulk_load(pd.DataFrame({'b': ['x']}), connection, 't')
+        
+        assert connection.execute("SELECT * FROM t").fetchall() == [('x',)]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
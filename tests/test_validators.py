@@ -0,0 +1,172 @@
+"""
+Unit tests for DataProcessing validation and cleaning functions.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from dataprocessing.validators import (
+    clean_dataframe, validate_dataframe, validate_email, validate_email_batch, validate_phone,
+    validate_numeric
+)
+
+
+class TestCleanDataFrame:
+    """Test cases for clean_dataframe."""
+    
+    def setup_method(self):
+        """Set up test data."""
+        self.df = pd.DataFrame({
+            'phone': ['555-1234', '(555) 5678', 'tel: 555–9012', '５５５-3456'],
+        })
+    
+    def test_regex_replace_character_class(self):
+        """Test removing a character class matches re.sub."""
+        cleaned = clean_dataframe(self.df, {'phone': {'regex_replace': {r'[^\d-]': ''}}})
+        expected = self.df['phone'].str.replace(r'[^\d-]', '', regex=True)
+        assert list(cleaned['phone']) == list(expected)
+        assert cleaned.loc[1, 'phone'] == '5555678'
+    
+    def test_replace_categorical(self):
+        """Test replace renames or merges categories."""
+        df = pd.DataFrame({'dept': pd.Categorical(['Sales', 'InvalidDept', 'HR'])})
+        
+        renamed = clean_dataframe(df, {'dept': {'replace': {'InvalidDept': 'Other'}}})
+        assert list(renamed['dept']) == ['Sales', 'Other', 'HR']
+        assert set(renamed['dept'].cat.categories) == {'HR', 'Other', 'Sales'}
+        
+        merged = clean_dataframe(df, {'dept': {'replace': {'InvalidDept': 'HR'}}})
+        assert list(merged['dept']) == ['Sales', 'HR', 'HR']
+        assert set(merged['dept'].cat.categories) == {'HR', 'Sales'}
+    
+    def test_regex_replace_general_pattern(self):
+        """Test general regex replacement."""
+        cleaned = clean_dataframe(self.df, {'phone': {'regex_replace': {r'^(\d{3})-': r'\1.'}}})
+        assert cleaned.loc[0, 'phone'] == '555.1234'
+        assert cleaned.loc[1, 'phone'] == '(555) 5678'
+    
+    def test_title_case(self):
+        """Test the title_case rule."""
+        df = pd.DataFrame({'name': ['  alice smith ', 'BOB JONES']})
+        cleaned = clean_dataframe(df, {'name': {'strip_whitespace': True, 'title_case': True}})
+        assert list(cleaned['name']) == ['Alice Smith', 'Bob Jones']
+    
+    def test_inplace(self):
+        """Test cleaning the passed DataFrame in place."""
+        df = pd.DataFrame({'email': ['A@Example.com'], 'age': [30]})
+        copy = clean_dataframe(df, {'email': {'lowercase': True}})
+        assert df.loc[0, 'email'] == 'A@Example.com'
+        
+        result = clean_dataframe(df, {'email': {'lowercase': True}}, inplace=True)
+        assert result is df
+        assert df.loc[0, 'email'] == copy.loc[0, 'email'] == 'a@example.com'
+    
+    def test_clip(self):
+        """Test clipping numeric values keeps missing values."""
+        df = pd.DataFrame({'salary': [-5000, 50000, None, 90000]})
+        cleaned = clean_dataframe(df, {'salary': {'clip': {'min': 0, 'max': 80000}}})
+        assert cleaned['salary'].tolist()[:2] == [0, 50000]
+        assert pd.isna(cleaned.loc[2, 'salary'])
+        assert cleaned.loc[3, 'salary'] == 80000
+    
+    def test_custom_ufunc(self):
+        """Test that a unary ufunc matches the equivalent per-value function."""
+        df = pd.DataFrame({'delta': [-1.5, 2.0, None]})
+        vectorized = clean_dataframe(df, {'delta': {'custom': np.abs}})
+        per_value = clean_dataframe(df, {'delta': {'custom': lambda x: abs(x)}})
+        assert vectorized['delta'].equals(per_value['delta'])
+        
+        # Ufuncs with two outputs are applied per value
+        split = clean_dataframe(df, {'delta': {'custom': np.modf}})
+        assert split['delta'].tolist()[:2] == [(-0.5, -1.0), (0.0, 2.0)]
+    
+    def test_arrow_strings(self):
+        """Test that Arrow-backed string columns keep their dtype and missing values."""
+        dtype = pd.ArrowDtype(pa.string())
+        df = pd.DataFrame({'phone': pd.Series(['555-1234 ', '(555) 5678', None], dtype=dtype)})
+        cleaned = clean_dataframe(df, {'phone': {'strip_whitespace': True,
+                                                 'regex_replace': {r'[^\d-]': ''}}})
+        assert cleaned['phone'].dtype == dtype
+        assert list(cleaned['phone'][:2]) == ['555-1234', '5555678']
+        assert cleaned['phone'].isna()[2]
+
+
+
+class TestValidateDataFrame:
+    """Test cases for validate_dataframe."""
+    
+    def setup_method(self):
+        """Set up test data."""
+        self.df = pd.DataFrame({
+            'email': ['a@example.com', 'invalid-email', None, '', 'b@example.org'],
+            'phone': ['555-1234', '123', None, '+1 (555) 123-4567', '5551234567890123'],
+            'age': [25, 150, None, 'abc', 40],
+            'date': ['2020-01-15', '2023-13-45', None, '', '2021-02-28'],
+            'department': ['Engineering', 'Sales', 'InvalidDept', None, 'HR'],
+        })
+    
+    def test_matches_scalar_validators(self):
+        """Test vectorized rules flag the same rows as the scalar validators."""
+        errors = validate_dataframe(self.df, {
+            'email': {'email': True},
+            'phone': {'phone': True},
+            'age': {'numeric': {'min': 18, 'max': 65}},
+        })
+        
+        expected_email = [i for i, v in self.df['email'].items() if not validate_email(v)]
+        expected_phone = [i for i, v in self.df['phone'].items() if not validate_phone(v)]
+        expected_age = [i for i, v in self.df['age'].items() if not validate_numeric(v, 18, 65)]
+        
+        assert errors['email'][0].row == expected_email
+        assert errors['phone'][0].row == expected_phone
+        assert errors['age'][0].row == expected_age
+    
+    def test_date_with_format(self):
+        """Test date validation with an explicit format."""
+        errors = validate_dataframe(self.df, {'date': {'date': {'format': '%Y-%m-%d'}}})
+        assert errors['date'][0].row == [1, 2, 3]
+    
+    def test_categorical(self):
+        """Test categorical validation ignores missing values."""
+        errors = validate_dataframe(self.df, {'department': {'categorical': ['Engineering', 'Sales', 'HR']}})
+        assert len(errors['department']) == 1
+        assert 'InvalidDept' in str(errors['department'][0])
+    
+    def test_categorical_dtype(self):
+        """Test categorical validation on category dtype ignores unused categories."""
+        series = self.df['department'].astype(
+            pd.CategoricalDtype(['Engineering', 'Sales', 'HR', 'InvalidDept', 'Unused'])
+        )
+        errors = validate_dataframe(pd.DataFrame({'department': series}),
+                                    {'department': {'categorical': ['Engineering', 'Sales', 'HR']}})
+        assert "{'InvalidDept'}" in str(errors['department'][0])
+    
+    def test_valid_data_has_no_errors(self):
+        """Test that valid data produces no errors."""
+        df = pd.DataFrame({'email': ['a@example.com'], 'age': [30]})
+        errors = validate_dataframe(df, {'email': {'required': True, 'email': True},
+                                         'age': {'numeric': {'min': 18}}})
+        assert errors == {}
+
+
+class TestValidateEmailBatch:
+    """Test cases for batch email validation."""
+    
+    def test_matches_validate_email(self):
+        """Test that the batch result matches validate_email per value."""
+        emails = pd.Series(['alice@example.com', 'invalid-email', None, '', 'b@x.co',
+                            'trailing@example.com\n', 'two@a.com\nthree@b.com', 12345,
+                            'ünï@example.com', 'c@d.org'], index=range(10, 20))
+        mask = validate_email_batch(emails)
+        assert list(mask.index) == list(emails.index)
+        assert mask.tolist() == [validate_email(value) for value in emails]
+    
+    def test_no_values(self):
+        """Test a column without any values."""
+        mask = validate_email_batch(pd.Series([None, ''], dtype=object))
+        assert mask.tolist() == [False, False]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])